@@ -1,6 +1,8 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import yfinance as yf
+from services.price_history import price_history
+from services.serialization import json_response, series_columns, series_pairs, wants_columnar
 
 app = Flask(__name__)
 CORS(app)
@@ -28,20 +30,19 @@ def get_fundamental_data(symbol):
 @app.route("/technical_stock_data/<symbol>")
 def get_technical_data(symbol):
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period="1mo")
+        # Coalesced with other symbols' requests and cached
+        hist = price_history.get(symbol.upper(), period="1mo")
 
         if hist.empty:
             return jsonify({"statistics": {"30": []}})
 
-        data = [
-            [int(date.timestamp() * 1000), row["Close"]]
-            for date, row in hist.iterrows()
-        ]
-        return jsonify({
-            "statistics": {
-                "30": data[-30:] if len(data) >= 30 else data
-            }
+        hist = hist.iloc[-30:]
+        if wants_columnar(request):
+            return json_response({
+                "statistics": {"30": series_columns(hist.index, close=hist["Close"].to_numpy())}
+            })
+        return json_response({
+            "statistics": {"30": series_pairs(hist.index, hist["Close"].to_numpy())}
         })
     except Exception as e:
         return jsonify({"statistics": {"30": []}, "error": str(e)}), 500
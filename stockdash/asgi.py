@@ -0,0 +1,180 @@
+# asgi.py
+#
+# Async serving mode. Run with:  uvicorn asgi:app --port 5000
+# or, multi-process:             WEB_MODE=asgi gunicorn -c gunicorn.conf.py asgi:app
+#
+# The data routes below are served natively on the event loop using the async
+# service variants (pooled HTTP client, per-upstream concurrency limits), so
+# one process can hold hundreds of in-flight requests. Every other path
+# (templates, static files) is handed to the Flask app in fmain.py.
+
+import asyncio
+import json
+import re
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from config import Config
+from fmain import create_app
+from services.PTC import TECHNICAL_INTERVALS, compute_statistics, get_intraday_closes_async
+from services.async_http import close_client
+from services.econdata import EconomicDataFetcher
+from services.metrics import observe_request
+from services.four_quadrant import get_macro_analysis_async
+from services.fundamental import calculate_fundamental_analysis_async
+from services.live_stats import format_sse, live_hub
+from services.news import get_news_async
+from services.yield_curve import get_yield_curve_async
+
+_flask = WsgiToAsgi(create_app())
+
+
+async def economic_data(params):
+    fetcher = EconomicDataFetcher()
+    data_type = params.get("type")
+    maturity = params.get("maturity", "10y")
+    interval = params.get("interval", "monthly")
+
+    if data_type == "cpi":
+        value = await fetcher.get_cpi_yoy_async()
+        label = "CPI YoY (%)"
+    elif data_type == "treasury":
+        value = await fetcher.get_treasury_yield_async(maturity)
+        label = f"Treasury Yield ({maturity})"
+    elif data_type == "fed_funds":
+        value = await fetcher.get_fed_funds_rate_async(interval)
+        label = f"Fed Funds Rate ({interval})"
+    else:
+        return 400, {"error": "Invalid type"}
+
+    return 200, {"label": label, "value": value}
+
+
+async def fundamental_stock_data(params, symbol):
+    return 200, await calculate_fundamental_analysis_async(symbol)
+
+
+async def technical_stock_data(params, symbol):
+    closes = await get_intraday_closes_async(symbol)
+    return 200, {"statistics": compute_statistics(closes, TECHNICAL_INTERVALS)}
+
+
+async def four_quadrant(params):
+    return 200, await get_macro_analysis_async()
+
+
+async def market_news(params):
+    return 200, await get_news_async()
+
+
+async def yield_curve(params):
+    try:
+        return 200, await get_yield_curve_async(params.get("date"))
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+ROUTES = [
+    ("/economic_data", re.compile(r"^/economic_data$"), economic_data),
+    ("/fundamental_stock_data/<symbol>",
+     re.compile(r"^/fundamental_stock_data/(?!batch$)([^/]+)$"), fundamental_stock_data),
+    ("/technical_stock_data/<symbol>", re.compile(r"^/technical_stock_data/([^/]+)$"), technical_stock_data),
+    ("/four_quadrant", re.compile(r"^/four_quadrant$"), four_quadrant),
+    ("/market_news", re.compile(r"^/market_news$"), market_news),
+    ("/yield_curve", re.compile(r"^/yield_curve$"), yield_curve),
+]
+
+
+async def _send_json(send, status, body):
+    payload = json.dumps(body, default=float).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+    return len(payload)
+
+
+STREAM = re.compile(r"^/stream/technical/([^/]+)$")
+
+
+async def _stream_technical(symbol, receive, send):
+    """
+    Native SSE: the shared poller pushes into an asyncio queue, so an open
+    stream costs no thread while idle.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        subscription = await asyncio.to_thread(live_hub.subscribe, symbol, loop=loop)
+    except Exception as e:
+        await _send_json(send, 500, {"error": str(e)})
+        return
+
+    async def disconnected():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+                (b"access-control-allow-origin", b"*"),
+            ],
+        })
+        while not watcher.done():
+            message = await subscription.get(timeout=Config.LIVE_HEARTBEAT_SECONDS)
+            chunk = format_sse(message) if message is not None else ": keep-alive\n\n"
+            await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+    finally:
+        watcher.cancel()
+        live_hub.unsubscribe(subscription)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] == "http" and scope["method"] == "GET":
+        stream = STREAM.match(scope["path"])
+        if stream:
+            await _stream_technical(stream.group(1), receive, send)
+            return
+        for rule, pattern, handler in ROUTES:
+            match = pattern.match(scope["path"])
+            if match:
+                query = parse_qs(scope.get("query_string", b"").decode())
+                params = {key: values[-1] for key, values in query.items()}
+                start = time.perf_counter()
+                try:
+                    status, body = await handler(params, *match.groups())
+                except Exception as e:
+                    status, body = 500, {"error": str(e)}
+                size = await _send_json(send, status, body)
+                observe_request(rule, "GET", status, time.perf_counter() - start, size)
+                return
+
+    await _flask(scope, receive, send)
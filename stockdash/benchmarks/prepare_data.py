@@ -0,0 +1,71 @@
+# benchmarks/prepare_data.py
+#
+# Compares DataManager.prepare_data (per-row strptime loop) with the
+# vectorized DataManager.prepare_data_arrays on synthetic daily series.
+#
+# Usage (from stockdash/):
+#   python -m benchmarks.prepare_data
+#   python -m benchmarks.prepare_data --sizes 1000 20000 --repeat 7 --json
+
+import argparse
+import datetime
+import json
+import random
+import timeit
+
+import numpy as np
+
+from services.data_manger import DataManager
+
+
+def make_series(n, seed=0):
+    """
+    Alpha Vantage shaped payload, newest first, n daily observations.
+    """
+    rng = random.Random(seed)
+    start = datetime.date(2024, 12, 31)
+    return {
+        "data": [
+            {"date": (start - datetime.timedelta(days=i)).isoformat(),
+             "value": f"{4 + rng.gauss(0, 0.5):.2f}"}
+            for i in range(n)
+        ]
+    }
+
+
+def bench(n, repeat):
+    data = make_series(n)
+    manager = DataManager()
+
+    X_loop, y_loop = manager.prepare_data(data)
+    X_vec, y_vec = DataManager.prepare_data_arrays(data)
+    assert np.allclose(X_loop, X_vec) and np.allclose(y_loop, y_vec)
+
+    loop = min(timeit.repeat(lambda: manager.prepare_data(data), number=1, repeat=repeat))
+    vec = min(timeit.repeat(lambda: DataManager.prepare_data_arrays(data), number=1, repeat=repeat))
+    return {
+        "rows": n,
+        "loop_ms": round(loop * 1000, 3),
+        "vectorized_ms": round(vec * 1000, 3),
+        "speedup": round(loop / vec, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = [bench(n, args.repeat) for n in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['rows']:>7} rows   loop {r['loop_ms']:>9} ms   "
+              f"vectorized {r['vectorized_ms']:>8} ms   x{r['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
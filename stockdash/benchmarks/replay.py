@@ -0,0 +1,388 @@
+# benchmarks/replay.py
+#
+# Offline stand-in transport for every upstream the services talk to.
+#
+#   Alpha Vantage -> alpha_vantage.client.session.get
+#   FRED          -> fred_cache fetcher hook
+#   yfinance      -> a stand-in `yfinance` module (download / Ticker)
+#   RSS           -> services.news.session.get
+#
+# By default responses are deterministic synthetic payloads shaped exactly
+# like the real responses, sized by `size` (number of bars / observations /
+# articles). With recorded=True (`benchmarks.run --recorded`), requests that
+# have a file in benchmarks/fixtures/ are answered from it instead. Fixtures
+# are named after the full request parameters (see fixture_name), and
+# `python -m benchmarks.replay --record` captures live ones. The committed
+# set is a small sample in the upstream formats; re-record to benchmark
+# against current live data.
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import types
+import zlib
+
+import numpy as np
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_name(upstream, params):
+    """
+    Fixture file name (no extension) for one upstream request, built from its
+    full parameter set so e.g. compact and full intraday pulls, or different
+    symbols, never share a fixture. API keys are left out.
+    """
+    parts = [upstream] + [
+        f"{key}-{value}" for key, value in sorted(params.items())
+        if key not in ("apikey", "api_key")
+    ]
+    return re.sub(r"[^A-Za-z0-9_.-]", "", "_".join(parts))
+
+
+def _recorded(name):
+    for ext, mode in ((".json", "r"), (".xml", "rb")):
+        path = os.path.join(FIXTURE_DIR, name + ext)
+        if os.path.exists(path):
+            with open(path, mode) as fh:
+                return json.load(fh) if ext == ".json" else fh.read()
+    return None
+
+
+def _rng(key):
+    # crc32 rather than hash(): str hashing is salted per process
+    return np.random.default_rng(zlib.crc32(repr(key).encode()))
+
+
+# --- synthetic payloads ---------------------------------------------------
+
+def intraday_payload(symbol, size, interval="5min"):
+    rng = _rng(("intraday", symbol))
+    end = datetime.datetime(2025, 1, 3, 19, 55)
+    closes = 150 + np.cumsum(rng.normal(0, 0.2, size))
+    series = {}
+    for i in range(size):
+        ts = (end - datetime.timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        c = closes[i]
+        series[ts] = {
+            "1. open": f"{c - 0.05:.4f}", "2. high": f"{c + 0.1:.4f}",
+            "3. low": f"{c - 0.1:.4f}", "4. close": f"{c:.4f}",
+            "5. volume": str(int(rng.integers(1000, 100000)))
+        }
+    return {"Meta Data": {"2. Symbol": symbol}, f"Time Series ({interval})": series}
+
+
+def economic_payload(function, size):
+    rng = _rng(("econ", function))
+    start = datetime.date(2025, 1, 1)
+    values = 4 + np.cumsum(rng.normal(0, 0.05, size))
+    return {
+        "name": function,
+        "data": [
+            {"date": (start - datetime.timedelta(days=i)).isoformat(), "value": f"{v:.2f}"}
+            for i, v in enumerate(values)
+        ]
+    }
+
+
+def fred_series(series_id, size):
+    import pandas as pd
+
+    rng = _rng(("fred", series_id))
+    freq = "QS" if series_id == "A191RL1Q225SBEA" else "MS"
+    index = pd.date_range(end="2025-01-01", periods=size, freq=freq)
+    if series_id == "CPIAUCSL":
+        values = 100 * np.cumprod(1 + rng.normal(0.002, 0.002, size))
+    else:
+        values = 2 + np.cumsum(rng.normal(0, 0.1, size))
+    return pd.Series(values, index=index)
+
+
+def price_frame(tickers, size):
+    import pandas as pd
+
+    index = pd.bdate_range(end="2025-01-03", periods=size)
+    market = _rng("market").normal(0.0004, 0.01, size)
+    frames = {}
+    for ticker in tickers:
+        rng = _rng(("prices", ticker))
+        returns = 0.0002 + rng.uniform(0.5, 1.5) * market + rng.normal(0, 0.01, size)
+        close = 100 * np.cumprod(1 + returns)
+        frames[ticker] = pd.DataFrame({
+            "Open": close * 0.998, "High": close * 1.01, "Low": close * 0.99,
+            "Close": close, "Volume": rng.integers(1e5, 1e7, size)
+        }, index=index)
+    return pd.concat(frames, axis=1)
+
+
+def ticker_info(symbol):
+    rng = _rng(("info", symbol))
+    return {
+        "symbol": symbol, "sector": "Technology", "marketCap": int(rng.integers(1e9, 3e12)),
+        "trailingEps": float(rng.uniform(1, 10)), "forwardEps": float(rng.uniform(1, 12)),
+        "totalRevenue": int(rng.integers(1e8, 4e11)), "netIncomeToCommon": int(rng.integers(1e7, 1e11)),
+        "freeCashflow": int(rng.integers(1e7, 1e11)), "operatingMargins": float(rng.uniform(0, 0.4)),
+        "returnOnEquity": float(rng.uniform(0, 0.5)), "beta": float(rng.uniform(0.5, 1.8)),
+        "dividendYield": float(rng.uniform(0, 0.03)), "regularMarketPrice": 150.0,
+        "regularMarketPreviousClose": 148.0
+    }
+
+
+def rss_payload(size):
+    items = "".join(
+        f"<item><title>Headline {i}</title><link>https://example.com/a/{i}</link>"
+        f"<pubDate>Fri, 03 Jan 2025 {i % 24:02d}:00:00 GMT</pubDate>"
+        f"<description>Summary {i}</description></item>"
+        for i in range(size)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+            f"{items}</channel></rss>").encode()
+
+
+# --- stand-in transport ---------------------------------------------------
+
+class _Response:
+    def __init__(self, payload):
+        self.status_code = 200
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FeedResponse(_Response):
+    def __init__(self, content):
+        super().__init__(None)
+        self.content = content
+        self.headers = {}
+
+
+def _fake_yfinance(size, recorded=False):
+    module = types.ModuleType("yfinance")
+
+    def download(tickers, period=None, interval=None, **kwargs):
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        return price_frame(list(tickers), size)
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+            info = _recorded(fixture_name("yfinance_info", {"symbol": symbol})) if recorded else None
+            self.info = info or ticker_info(symbol)
+
+        def history(self, period="1mo", **kwargs):
+            return price_frame([self.symbol], size)[self.symbol]
+
+    module.download = download
+    module.Ticker = Ticker
+    return module
+
+
+def reset_caches():
+    """
+    Clear every in-process cache so the next call pays the full (replayed) cost.
+    """
+    from services import fundamental, four_quadrant, quadrant_visual
+    from services.fred_cache import fred_cache
+    from services.macro_indicators import reset_indicators
+    from services.news import news_cache
+    from services.price_history import price_history
+    from services.shared_cache import shared_cache
+
+    fred_cache.invalidate()
+    reset_indicators()
+    shared_cache.clear()
+    four_quadrant.invalidate_macro_snapshot(refetch=False)
+    with price_history._lock:
+        price_history._cache.clear()
+    with fundamental._fundamentals_lock:
+        fundamental._fundamentals_cache.clear()
+    with quadrant_visual._image_lock:
+        quadrant_visual._image_cache.clear()
+    news_cache.reset()
+
+
+def _fred_fixture(series_id, **kwargs):
+    import pandas as pd
+
+    recorded = _recorded(fixture_name("fred", {"series_id": series_id}))
+    if recorded is None:
+        return None
+    series = pd.Series(recorded["values"], index=pd.to_datetime(recorded["dates"]))
+    # FRED filters by date server-side; the fixture holds the whole history
+    if kwargs.get("observation_start"):
+        series = series[series.index >= pd.Timestamp(kwargs["observation_start"])]
+    if kwargs.get("observation_end"):
+        series = series[series.index <= pd.Timestamp(kwargs["observation_end"])]
+    return series
+
+
+@contextlib.contextmanager
+def replay(size=500, recorded=False):
+    """
+    Route all upstream traffic to stand-ins for the duration of the block:
+    synthetic payloads of `size`, or committed fixtures where they exist when
+    recorded=True. Disk caches and generated images are redirected to a
+    temporary directory.
+    """
+    from config import Config
+    from services import alpha_vantage, news
+    from services.bar_store import bar_store
+    from services.fred_cache import fred_cache
+    from services.news import news_cache
+    from services.price_history import price_history
+    from services.shared_cache import SQLiteCache, shared_cache
+
+    tmp = tempfile.mkdtemp(prefix="stockdash-bench-")
+    saved = {
+        "session_get": alpha_vantage.client.session.get,
+        "bucket_reserve": alpha_vantage.client.bucket.reserve,
+        "fred_fetcher": fred_cache._fetcher,
+        "fred_dir": fred_cache.cache_dir,
+        "bar_root": bar_store.root,
+        "price_window": price_history.window,
+        "yfinance": sys.modules.get("yfinance"),
+        "news_get": news.session.get,
+        "intraday_refresh": Config.INTRADAY_REFRESH_SECONDS,
+        "indicator_dir": Config.MACRO_INDICATOR_DIR,
+        "image_dir": Config.MACRO_IMAGE_DIR,
+        "shared_backend": shared_cache.backend,
+        "warehouse": Config.WAREHOUSE_ENABLED,
+    }
+
+    def av_get(url, params=None, timeout=None):
+        function = params["function"]
+        fixture = _recorded(fixture_name("alpha_vantage", params)) if recorded else None
+        if fixture is not None:
+            return _Response(fixture)
+        if function == "TIME_SERIES_INTRADAY":
+            return _Response(intraday_payload(params["symbol"], size, params.get("interval", "5min")))
+        return _Response(economic_payload(function, size))
+
+    def fred_fetch(series_id, **kwargs):
+        fixture = _fred_fixture(series_id, **kwargs) if recorded else None
+        if fixture is not None:
+            return fixture
+        series = fred_series(series_id, size)
+        if kwargs.get("observation_start"):
+            series = series[series.index >= kwargs["observation_start"]]
+        return series
+
+    def rss_get(url, headers=None, timeout=None):
+        fixture = _recorded(fixture_name("rss", {"url": url})) if recorded else None
+        return _FeedResponse(fixture or rss_payload(min(size, 200)))
+
+    alpha_vantage.client.session.get = av_get
+    alpha_vantage.client.bucket.reserve = lambda: 0.0
+    fred_cache._fetcher = fred_fetch
+    fred_cache.cache_dir = os.path.join(tmp, "fred")
+    os.makedirs(fred_cache.cache_dir)
+    bar_store.root = os.path.join(tmp, "bars")
+    os.makedirs(bar_store.root)
+    price_history.window = 0.001
+    sys.modules["yfinance"] = _fake_yfinance(size, recorded)
+    news.session.get = rss_get
+    Config.INTRADAY_REFRESH_SECONDS = 0
+    Config.MACRO_INDICATOR_DIR = os.path.join(tmp, "indicators")
+    Config.MACRO_IMAGE_DIR = os.path.join(tmp, "static")
+    # Synthetic histories have fixed dates; the warehouse has its own benchmark
+    Config.WAREHOUSE_ENABLED = False
+    if shared_cache.shared:
+        shared_cache.configure(SQLiteCache(os.path.join(tmp, "shared_cache.sqlite3")))
+    reset_caches()
+    try:
+        yield
+    finally:
+        reset_caches()
+        alpha_vantage.client.session.get = saved["session_get"]
+        alpha_vantage.client.bucket.reserve = saved["bucket_reserve"]
+        fred_cache._fetcher = saved["fred_fetcher"]
+        fred_cache.cache_dir = saved["fred_dir"]
+        bar_store.root = saved["bar_root"]
+        price_history.window = saved["price_window"]
+        if saved["yfinance"] is not None:
+            sys.modules["yfinance"] = saved["yfinance"]
+        else:
+            sys.modules.pop("yfinance", None)
+        news.session.get = saved["news_get"]
+        Config.INTRADAY_REFRESH_SECONDS = saved["intraday_refresh"]
+        Config.MACRO_INDICATOR_DIR = saved["indicator_dir"]
+        Config.MACRO_IMAGE_DIR = saved["image_dir"]
+        shared_cache.configure(saved["shared_backend"])
+        Config.WAREHOUSE_ENABLED = saved["warehouse"]
+        news_cache.stop()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def save_fixture(upstream, params, payload):
+    """
+    Write one fixture under fixture_name(upstream, params); bytes are stored
+    as .xml (RSS), everything else as .json.
+    """
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    name = fixture_name(upstream, params)
+    if isinstance(payload, bytes):
+        with open(os.path.join(FIXTURE_DIR, name + ".xml"), "wb") as fh:
+            fh.write(payload)
+    else:
+        with open(os.path.join(FIXTURE_DIR, name + ".json"), "w") as fh:
+            json.dump(payload, fh)
+    print(f"recorded {name}")
+
+
+def record(symbol="AAPL"):
+    """
+    Capture real upstream responses into benchmarks/fixtures/ (needs network
+    and API keys), keyed by the exact parameters the services send.
+    """
+    from config import Config
+    from services import alpha_vantage, news
+    from services.econdata import MATURITY_MAP
+    from services.fred_cache import fred_cache
+    from services.PTC import _intraday_params
+
+    def save_alpha_vantage(function, **kwargs):
+        kwargs.setdefault("datatype", "json")
+        params = alpha_vantage.client.params(function, **kwargs)
+        save_fixture("alpha_vantage", params, alpha_vantage.client.get_json(function, **kwargs))
+
+    for outputsize in ("compact", "full"):
+        save_alpha_vantage("TIME_SERIES_INTRADAY", **_intraday_params(symbol, "5min", True, True, outputsize, "json"))
+    save_alpha_vantage("TREASURY_YIELD", interval="monthly", maturity="10year")
+
+    for series_id in ("A191RL1Q225SBEA", "CPIAUCSL", "FEDFUNDS", *MATURITY_MAP.values()):
+        series = fred_cache._fetch_upstream(series_id).dropna()
+        save_fixture("fred", {"series_id": series_id}, {
+            "dates": series.index.strftime("%Y-%m-%d").tolist(),
+            "values": series.tolist()
+        })
+
+    import yfinance as yf
+    save_fixture("yfinance_info", {"symbol": symbol}, yf.Ticker(symbol).info)
+
+    for url in Config.NEWS_FEEDS:
+        response = news.session.get(url, timeout=Config.HTTP_TIMEOUT)
+        response.raise_for_status()
+        save_fixture("rss", {"url": url}, response.content)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", action="store_true", help="capture live responses into fixtures/")
+    parser.add_argument("--symbol", default="AAPL")
+    args = parser.parse_args()
+    if args.record:
+        record(args.symbol)
+    else:
+        parser.print_help()
@@ -0,0 +1,228 @@
+# benchmarks/run.py
+#
+# Offline benchmark suite. Every upstream is replayed (benchmarks/replay.py),
+# so results are comparable across runs and machines: synthetic payloads by
+# default, committed fixtures in benchmarks/fixtures/ with --recorded.
+#
+# Usage (from stockdash/):
+#   python -m benchmarks.run                              # all benchmarks, default sizes
+#   python -m benchmarks.run --sizes 100 1000 --only compute_statistics flask_routes
+#   python -m benchmarks.run --output results/today.json
+#   python -m benchmarks.run --compare results/before.json
+#   python -m benchmarks.run --recorded --only flask_routes
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+import warnings
+
+from benchmarks.replay import economic_payload, replay, reset_caches
+
+ROUTES = [
+    "/economic_data?type=cpi",
+    "/economic_data?type=treasury&maturity=10y",
+    "/four_quadrant",
+    "/macro_box",
+    "/fundamental_stock_data/AAPL",
+    "/technical_stock_data/AAPL",
+    "/market_news",
+    "/rolling_beta?symbols=AAPL,MSFT,NVDA&window=20",
+    "/yield_curve",
+    "/yield_curve/spreads",
+    "/dashboard/AAPL",
+]
+
+
+def _timed(fn, repeat, setup=None):
+    # One untimed call first so lazy imports don't land in the samples
+    if setup is not None:
+        setup()
+    fn()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "repeat": repeat,
+    }
+
+
+def bench_compute_statistics(size, repeat):
+    from benchmarks.replay import intraday_payload
+    from services.PTC import compute_statistics
+
+    data = intraday_payload("AAPL", max(size, 150))["Time Series (5min)"]
+    return _timed(lambda: compute_statistics(data, [30, 60, 90, 120, 150]), repeat)
+
+
+def bench_prepare_data(size, repeat):
+    from services.data_manger import DataManager
+
+    data = economic_payload("TREASURY_YIELD", size)
+    return _timed(lambda: DataManager.prepare_data_arrays(data), repeat)
+
+
+def bench_train_linear_regression(size, repeat):
+    from services.model_predictions import ModelPredictions
+
+    data = economic_payload("TREASURY_YIELD", size)
+    return _timed(lambda: ModelPredictions.train_linear_regression(data), repeat)
+
+
+def bench_run_ols_model(size, repeat):
+    from services.econometrics import run_ols_model
+
+    return _timed(lambda: run_ols_model("AAPL"), repeat, setup=reset_caches)
+
+
+def bench_run_arima_forecast(size, repeat):
+    from services.econometrics import run_arima_forecast
+
+    return _timed(lambda: run_arima_forecast("AAPL"), repeat, setup=reset_caches)
+
+
+def bench_draw_macro_quadrant_box(size, repeat):
+    from services.quadrant_visual import render_macro_quadrant_box
+
+    # Uncached render cost (the cache is cleared before every sample)
+    return _timed(lambda: render_macro_quadrant_box(1.5, 3.2), repeat, setup=reset_caches)
+
+
+def bench_warehouse(size, repeat):
+    import os
+    import shutil
+    import tempfile
+
+    from benchmarks.replay import fred_series, price_frame
+    from services.warehouse import Warehouse
+
+    tmp = tempfile.mkdtemp(prefix="stockdash-warehouse-")
+    try:
+        warehouse = Warehouse(os.path.join(tmp, "bench.db"), offline=False)
+        series = fred_series("GS10", size)
+        frame = price_frame(["AAPL"], size)["AAPL"]
+        return {
+            "upsert_series": _timed(lambda: warehouse.upsert_series("GS10", series), repeat),
+            "read_series": _timed(lambda: warehouse.series("GS10"), repeat),
+            "upsert_prices": _timed(lambda: warehouse.upsert_prices("AAPL", frame), repeat),
+            "read_prices": _timed(lambda: warehouse.prices("AAPL"), repeat),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_flask_routes(size, repeat):
+    from fmain import app
+
+    client = app.test_client()
+    results = {}
+    for route in ROUTES:
+        status = {}
+
+        def call(route=route):
+            status["code"] = client.get(route).status_code
+
+        cold = _timed(call, repeat, setup=reset_caches)
+        warm = _timed(call, repeat)
+        results[route] = {"cold": cold, "warm": warm, "status": status["code"]}
+    return results
+
+
+BENCHMARKS = {
+    "compute_statistics": bench_compute_statistics,
+    "prepare_data": bench_prepare_data,
+    "train_linear_regression": bench_train_linear_regression,
+    "run_ols_model": bench_run_ols_model,
+    "run_arima_forecast": bench_run_arima_forecast,
+    "draw_macro_quadrant_box": bench_draw_macro_quadrant_box,
+    "warehouse": bench_warehouse,
+    "flask_routes": bench_flask_routes,
+}
+
+
+def _git_rev():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, only=None, recorded=False):
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "recorded": recorded,
+        },
+        "benchmarks": {},
+    }
+    for name, fn in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        results["benchmarks"][name] = {}
+        for size in sizes:
+            with replay(size, recorded=recorded):
+                label = f"{size}-recorded" if recorded else str(size)
+                results["benchmarks"][name][label] = fn(size, repeat)
+    return results
+
+
+def _flatten(node, prefix=""):
+    if isinstance(node, dict) and "median_ms" in node:
+        yield prefix, node["median_ms"]
+        return
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _flatten(value, f"{prefix}/{key}" if prefix else key)
+
+
+def compare(baseline, current):
+    before = dict(_flatten(baseline["benchmarks"]))
+    for key, now in _flatten(current["benchmarks"]):
+        if key in before and before[key]:
+            ratio = now / before[key]
+            flag = "  REGRESSION" if ratio > 1.2 else ""
+            print(f"{key:<70} {before[key]:>10.3f} -> {now:>10.3f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--recorded", action="store_true",
+                        help="answer from benchmarks/fixtures/ where a fixture exists")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    results = run(args.sizes, args.repeat, args.only, args.recorded)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), results)
+    elif not args.output:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/serialization.py
+#
+# Per-request CPU for serializing a price-history frame:
+#   iterrows + jsonify (old /technical_stock_data)  vs
+#   vectorized pairs / columnar + json_response (services/serialization.py)
+#
+# Usage (from stockdash/):
+#   python -m benchmarks.serialization --rows 30 1000 100000
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify
+
+from services.serialization import json_response, series_columns, series_pairs
+
+app = Flask(__name__)
+
+
+def make_history(rows):
+    index = pd.date_range("2020-01-01", periods=rows, freq="5min", tz="America/New_York")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.1, rows))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def iterrows_jsonify(hist):
+    data = [[int(date.timestamp() * 1000), row["Close"]] for date, row in hist.iterrows()]
+    return jsonify({"statistics": {"30": data}}).get_data()
+
+
+def vectorized_pairs(hist):
+    return json_response({"statistics": {"30": series_pairs(hist.index, hist["Close"].to_numpy())}}).get_data()
+
+
+def vectorized_columnar(hist):
+    return json_response({"statistics": {"30": series_columns(hist.index, close=hist["Close"].to_numpy())}}).get_data()
+
+
+def cpu_ms(fn, hist, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn(hist)
+        best = min(best, time.process_time() - start)
+    return round(best * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[30, 1000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    with app.app_context():
+        for rows in args.rows:
+            hist = make_history(rows)
+            assert json.loads(iterrows_jsonify(hist)) == json.loads(vectorized_pairs(hist))
+            results.append({
+                "rows": rows,
+                "iterrows_jsonify_ms": cpu_ms(iterrows_jsonify, hist, args.repeat),
+                "vectorized_pairs_ms": cpu_ms(vectorized_pairs, hist, args.repeat),
+                "vectorized_columnar_ms": cpu_ms(vectorized_columnar, hist, args.repeat),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['rows']:>7} rows   iterrows+jsonify {r['iterrows_jsonify_ms']:>9} ms   "
+              f"pairs {r['vectorized_pairs_ms']:>8} ms   columnar {r['vectorized_columnar_ms']:>8} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/startup.py
+#
+# Cold-start benchmark: measures, in fresh interpreters,
+#   1. import time of fmain.py (server) and main.py (CLI)
+#   2. first-request latency per Flask route (includes lazy imports + upstream calls)
+#
+# Usage (from stockdash/):
+#   python -m benchmarks.startup                # imports only
+#   python -m benchmarks.startup --routes       # imports + first request per route
+#   python -m benchmarks.startup --repeat 5 --json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = [
+    "/four_quadrant",
+    "/economic_data?type=cpi",
+    "/fundamental_stock_data/AAPL",
+    "/technical_stock_data/AAPL",
+    "/macro_box",
+    "/market_news",
+]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+ROUTE_SNIPPET = """
+import time
+start = time.perf_counter()
+from fmain import app
+imported = time.perf_counter()
+response = app.test_client().get({route!r})
+done = time.perf_counter()
+print(imported - start, done - imported, response.status_code)
+"""
+
+
+def _run(snippet):
+    env = dict(os.environ, MPLBACKEND="Agg")
+    out = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return out.stdout.strip().splitlines()[-1].split()
+
+
+def bench_import(module, repeat):
+    samples = [float(_run(IMPORT_SNIPPET.format(module=module))[0]) for _ in range(repeat)]
+    return {"median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1)}
+
+
+def bench_route(route, repeat):
+    first = []
+    status = None
+    for _ in range(repeat):
+        _, latency, status = _run(ROUTE_SNIPPET.format(route=route))
+        first.append(float(latency))
+    return {"first_request_median_ms": round(statistics.median(first) * 1000, 1),
+            "status": int(status)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--routes", action="store_true", help="also time the first request per route")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {"imports": {m: bench_import(m, args.repeat) for m in ("fmain", "main")}}
+    if args.routes:
+        results["routes"] = {r: bench_route(r, args.repeat) for r in ROUTES}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for module, r in results["imports"].items():
+        print(f"import {module:<10} median {r['median_ms']:>8} ms   min {r['min_ms']:>8} ms")
+    for route, r in results.get("routes", {}).items():
+        print(f"GET {route:<32} first request {r['first_request_median_ms']:>8} ms   [{r['status']}]")
+
+
+if __name__ == "__main__":
+    main()
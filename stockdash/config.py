@@ -21,5 +21,108 @@ class Config:
     # (Optional) DB / Caching
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Local time-series warehouse in the database above (services/warehouse.py)
+    WAREHOUSE_ENABLED = os.getenv("WAREHOUSE_ENABLED", "True") == "True"
+    WAREHOUSE_OFFLINE = os.getenv("WAREHOUSE_OFFLINE", "False") == "True"  # never call upstream
+    WAREHOUSE_ECONOMIC_TTL = int(os.getenv("WAREHOUSE_ECONOMIC_TTL", str(12 * 60 * 60)))
+    WAREHOUSE_PRICE_TTL = int(os.getenv("WAREHOUSE_PRICE_TTL", str(60 * 60)))
+    # Each FRED sync re-reads this many days before the last stored date to pick
+    # up routine revisions (annual benchmark revisions need a full re-backfill)
+    WAREHOUSE_FRED_REVISION_DAYS = int(os.getenv("WAREHOUSE_FRED_REVISION_DAYS", "400"))
     CACHE_TYPE = os.getenv("CACHE_TYPE", "simple")
     CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
+    # Cross-worker tier for CACHE_TYPE=sqlite|filesystem (see services/shared_cache.py)
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", ".cache/shared_cache.sqlite3")
+    CACHE_SQLITE_TIMEOUT = float(os.getenv("CACHE_SQLITE_TIMEOUT", "5"))
+
+    # Production server (gunicorn.conf.py)
+    WEB_MODE = os.getenv("WEB_MODE", "wsgi")  # wsgi (threaded workers) or asgi (uvicorn workers)
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 2)))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "8"))
+    WEB_BIND = os.getenv("WEB_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "120"))
+
+    # FRED series cache (in-memory LRU + optional on-disk tier)
+    FRED_CACHE_MAX_ENTRIES = int(os.getenv("FRED_CACHE_MAX_ENTRIES", "64"))
+    FRED_CACHE_DIR = os.getenv("FRED_CACHE_DIR", ".cache/fred")
+
+    # Incrementally maintained macro indicators (raw + derived history)
+    MACRO_INDICATOR_DIR = os.getenv("MACRO_INDICATOR_DIR", ".cache/indicators")
+
+    # Batch fundamentals
+    FUNDAMENTAL_MAX_WORKERS = int(os.getenv("FUNDAMENTAL_MAX_WORKERS", "16"))
+    FUNDAMENTAL_BATCH_LIMIT = int(os.getenv("FUNDAMENTAL_BATCH_LIMIT", "500"))
+    FUNDAMENTAL_CACHE_TTL = int(os.getenv("FUNDAMENTAL_CACHE_TTL", "900"))
+
+    # Local intraday bar store
+    BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", ".cache/bars")
+    INTRADAY_REFRESH_SECONDS = int(os.getenv("INTRADAY_REFRESH_SECONDS", "300"))
+
+    # Async (ASGI) serving mode
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+    ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", "100"))
+    ASYNC_UPSTREAM_LIMITS = {
+        "alpha_vantage": int(os.getenv("ASYNC_LIMIT_ALPHA_VANTAGE", "5")),
+        "fred": int(os.getenv("ASYNC_LIMIT_FRED", "8")),
+        "yfinance": int(os.getenv("ASYNC_LIMIT_YFINANCE", "16")),
+        "rss": int(os.getenv("ASYNC_LIMIT_RSS", "4")),
+        "disk": int(os.getenv("ASYNC_LIMIT_DISK", "8")),  # bar store / cache files
+    }
+
+    # Alpha Vantage client (pooling, retries, rate limit)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    ALPHA_VANTAGE_CALLS_PER_MINUTE = int(os.getenv("ALPHA_VANTAGE_CALLS_PER_MINUTE", "75"))
+    ALPHA_VANTAGE_MAX_RETRIES = int(os.getenv("ALPHA_VANTAGE_MAX_RETRIES", "4"))
+    ALPHA_VANTAGE_BACKOFF = float(os.getenv("ALPHA_VANTAGE_BACKOFF", "1.0"))
+
+    # Macro quadrant image cache
+    MACRO_IMAGE_CACHE_SIZE = int(os.getenv("MACRO_IMAGE_CACHE_SIZE", "16"))
+    MACRO_IMAGE_MAX_AGE = int(os.getenv("MACRO_IMAGE_MAX_AGE", "3600"))
+    MACRO_IMAGE_FILES_KEEP = int(os.getenv("MACRO_IMAGE_FILES_KEEP", "16"))  # charts kept on disk
+    MACRO_IMAGE_DIR = os.getenv("MACRO_IMAGE_DIR", "static")  # /macro_box URLs assume the default
+
+    # News feed cache
+    NEWS_FEEDS = [
+        url.strip() for url in
+        os.getenv("NEWS_FEEDS", "https://seekingalpha.com/feed.xml").split(",")
+        if url.strip()
+    ]
+    NEWS_REFRESH_SECONDS = int(os.getenv("NEWS_REFRESH_SECONDS", "120"))
+    NEWS_LIMIT = int(os.getenv("NEWS_LIMIT", "10"))
+
+    # ARIMA forecasting service
+    FORECAST_CACHE_PATH = os.getenv("FORECAST_CACHE_PATH", ".cache/forecasts.json")
+    FORECAST_MAX_WORKERS = int(os.getenv("FORECAST_MAX_WORKERS", str(os.cpu_count() or 2)))
+    FORECAST_BATCH_LIMIT = int(os.getenv("FORECAST_BATCH_LIMIT", "100"))
+    FORECAST_MAX_ORDER = int(os.getenv("FORECAST_MAX_ORDER", "5"))  # cap on each of p, d, q
+
+    # Shared price-history provider (micro-batched yf.download)
+    PRICE_BATCH_WINDOW_MS = int(os.getenv("PRICE_BATCH_WINDOW_MS", "50"))
+    PRICE_CACHE_TTL = int(os.getenv("PRICE_CACHE_TTL", "300"))
+
+    # Aggregated /dashboard/<symbol> route
+    DASHBOARD_MAX_WORKERS = int(os.getenv("DASHBOARD_MAX_WORKERS", "8"))
+    DASHBOARD_TIMEOUT = float(os.getenv("DASHBOARD_TIMEOUT", "20"))  # seconds, whole request
+    DASHBOARD_GZIP_LEVEL = int(os.getenv("DASHBOARD_GZIP_LEVEL", "6"))
+    DASHBOARD_GZIP_MIN_BYTES = int(os.getenv("DASHBOARD_GZIP_MIN_BYTES", "1024"))
+
+    # Live technical statistics stream (SSE)
+    LIVE_POLL_SECONDS = int(os.getenv("LIVE_POLL_SECONDS", "30"))
+    LIVE_HEARTBEAT_SECONDS = int(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+    LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "64"))
+    # Open streams per process under WSGI, where each one holds a worker thread
+    # (asgi.py streams cost no thread and are not capped)
+    LIVE_MAX_WSGI_STREAMS = int(os.getenv("LIVE_MAX_WSGI_STREAMS", str(max(WEB_THREADS // 2, 1))))
+
+    # Background pre-warm scheduler
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "False") == "True"
+    SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+    WATCHLIST = [s.strip().upper() for s in os.getenv("WATCHLIST", "").split(",") if s.strip()]
+    SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", ".cache/scheduler.lock")
+    SCHEDULE_MACRO_SECONDS = int(os.getenv("SCHEDULE_MACRO_SECONDS", "3600"))
+    SCHEDULE_FUNDAMENTALS_SECONDS = int(os.getenv("SCHEDULE_FUNDAMENTALS_SECONDS", str(FUNDAMENTAL_CACHE_TTL * 2 // 3)))
+    SCHEDULE_INTRADAY_SECONDS = int(os.getenv("SCHEDULE_INTRADAY_SECONDS", str(INTRADAY_REFRESH_SECONDS * 2 // 3)))
+
+    # Instrumentation (/metrics is always on; ?profile=1 is opt-in)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+    PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "40"))
@@ -1,17 +1,42 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 from config import Config
-from services.fundamental import calculate_fundamental_analysis
+from services.fundamental import calculate_fundamental_analysis, iter_fundamental_data, get_fundamental_data_many
 from services.econdata import EconomicDataFetcher
 from services.news import get_news
-from services.four_quadrant import get_macro_analysis
-from services.quadrant_visual import draw_macro_quadrant_box
-from services.PTC import fetch_intraday_data, compute_statistics
+from services.dashboard import build_dashboard
+from services.live_stats import format_sse, live_hub
+from services.four_quadrant import get_macro_analysis, get_macro_snapshot
+from services.macro_indicators import INDICATOR_PERIODS, get_indicator
+from services.yield_curve import get_yield_curve, yield_curve
+from services.quadrant_visual import MIME_TYPES, draw_macro_quadrant_box, render_macro_quadrant_box
+from services.econometrics import run_rolling_ols_universe
+from services.forecasting import forecast_many
+from services import metrics
+from services.scheduler import scheduler, start_scheduler
+from services.serialization import compressed_json_response, json_response
+from services.PTC import TECHNICAL_INTERVALS, get_intraday_closes, compute_statistics
+import json
 import os
+import threading
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
 CORS(app)  # Allow frontend requests
 app.config.from_object(Config)
+metrics.init_app(app)
+
+def create_app():
+    """
+    Per-process startup for the production entry points (wsgi.py, asgi.py):
+    builds the shared cache backend from Config.CACHE_TYPE and, when enabled,
+    starts the pre-warm scheduler in exactly one worker per host.
+    """
+    from services.shared_cache import shared_cache
+
+    _ = shared_cache.backend  # built now, so an unsupported CACHE_TYPE fails at startup
+    if Config.SCHEDULER_ENABLED:
+        start_scheduler(lock_path=Config.SCHEDULER_LOCK_PATH)
+    return app
 
 @app.route("/")
 def index():
@@ -57,13 +82,162 @@ def fundamental_stock_data(symbol):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/fundamental_stock_data/batch", methods=["POST"])
+def fundamental_stock_data_batch():
+    """
+    Body: {"symbols": ["AAPL", "MSFT", ...], "stream": false}
+    With stream=true the response is NDJSON, one line per symbol as it completes.
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        symbols = body.get("symbols") or []
+        if not isinstance(symbols, list) or not symbols:
+            return jsonify({"error": "Provide a non-empty 'symbols' list"}), 400
+        if not all(isinstance(s, str) for s in symbols):
+            return jsonify({"error": "Every symbol must be a string"}), 400
+        if len(symbols) > Config.FUNDAMENTAL_BATCH_LIMIT:
+            return jsonify({"error": f"At most {Config.FUNDAMENTAL_BATCH_LIMIT} symbols per batch"}), 400
+
+        macro = get_macro_snapshot().to_dict()
+
+        if body.get("stream"):
+            def generate():
+                for symbol, result, elapsed_ms in iter_fundamental_data(symbols, macro=macro):
+                    yield json.dumps({"symbol": symbol, "elapsed_ms": elapsed_ms, **result}) + "\n"
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        return jsonify(get_fundamental_data_many(symbols, macro=macro))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/technical_stock_data/<symbol>")
 def technical_stock_data(symbol):
     try:
-        raw = fetch_intraday_data(symbol)
-        intervals = [30, 60, 90, 120, 150]
-        stats = compute_statistics(raw, intervals)
-        return jsonify({"statistics": stats})
+        raw = get_intraday_closes(symbol)
+        stats = compute_statistics(raw, TECHNICAL_INTERVALS)
+        return json_response({"statistics": stats})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/dashboard/<symbol>")
+def dashboard(symbol):
+    """
+    One round-trip for the main page: fundamentals, technical stats, macro
+    quadrant and news for `symbol`, gzip-encoded when the client accepts it.
+    """
+    try:
+        return compressed_json_response(
+            build_dashboard(symbol),
+            request,
+            level=Config.DASHBOARD_GZIP_LEVEL,
+            min_bytes=Config.DASHBOARD_GZIP_MIN_BYTES
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Each WSGI stream pins a worker thread for as long as the viewer stays
+_wsgi_streams = threading.BoundedSemaphore(Config.LIVE_MAX_WSGI_STREAMS)
+
+@app.route("/stream/technical/<symbol>")
+def stream_technical(symbol):
+    """
+    Server-Sent Events: a full `snapshot` of the windowed statistics, then a
+    `delta` (changed fields only) whenever a new or revised bar arrives.
+    All viewers of a symbol share one upstream poller.
+
+    Under WSGI every open stream holds a worker thread, so at most
+    Config.LIVE_MAX_WSGI_STREAMS are served per process (503 beyond that).
+    Serve many viewers with WEB_MODE=asgi, where asgi.py streams natively.
+    """
+    if not _wsgi_streams.acquire(blocking=False):
+        return jsonify({"error": "Too many open streams on this worker; retry later"}), 503
+    try:
+        subscription = live_hub.subscribe(symbol)
+    except Exception as e:
+        _wsgi_streams.release()
+        return jsonify({"error": str(e)}), 500
+
+    def generate():
+        try:
+            while True:
+                message = subscription.get(timeout=Config.LIVE_HEARTBEAT_SECONDS)
+                yield format_sse(message) if message is not None else ": keep-alive\n\n"
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    # Runs even if the client leaves before the first frame is sent
+    response.call_on_close(_wsgi_streams.release)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+@app.route("/stream/status")
+def stream_status():
+    return jsonify(live_hub.stats())
+
+@app.route("/rolling_beta", methods=["GET", "POST"])
+def rolling_beta():
+    """
+    GET  /rolling_beta?symbols=AAPL,MSFT&window=60&period=1y&index=^GSPC
+    POST /rolling_beta  {"symbols": [...], "window": 60, "period": "1y", "index": "^GSPC"}
+    """
+    try:
+        params = (request.get_json(silent=True) or {}) if request.method == "POST" else request.args
+        symbols = params.get("symbols") or []
+        if isinstance(symbols, str):
+            symbols = symbols.split(",")
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return jsonify({"error": "'symbols' must be a list of strings"}), 400
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        if not symbols:
+            return jsonify({"error": "Provide at least one symbol"}), 400
+        try:
+            window = int(params.get("window", 60))
+        except (TypeError, ValueError):
+            return jsonify({"error": "'window' must be an integer"}), 400
+        if window < 2:
+            return jsonify({"error": "'window' must be at least 2"}), 400
+
+        result = run_rolling_ols_universe(
+            symbols,
+            index_symbol=params.get("index", "^GSPC"),
+            period=params.get("period", "1y"),
+            window=window
+        )
+        return json_response(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/forecast/batch", methods=["POST"])
+def forecast_batch():
+    """
+    Body: {"symbols": [...], "order": [1, 1, 1], "period": "3mo"}
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        symbols = body.get("symbols") or []
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return jsonify({"error": "'symbols' must be a list of strings"}), 400
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        if not symbols:
+            return jsonify({"error": "Provide a non-empty 'symbols' list"}), 400
+        if len(symbols) > Config.FORECAST_BATCH_LIMIT:
+            return jsonify({"error": f"At most {Config.FORECAST_BATCH_LIMIT} symbols per batch"}), 400
+        order = body.get("order", [1, 1, 1])
+        if (not isinstance(order, list) or len(order) != 3
+                or not all(type(o) is int and 0 <= o <= Config.FORECAST_MAX_ORDER for o in order)):
+            return jsonify({
+                "error": f"'order' must be three integers (p, d, q) between 0 and {Config.FORECAST_MAX_ORDER}"
+            }), 400
+
+        result = forecast_many(
+            symbols,
+            order=tuple(order),
+            period=body.get("period", "3mo")
+        )
+        return json_response(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -75,6 +249,48 @@ def four_quadrant():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/yield_curve")
+def yield_curve_latest():
+    """
+    Treasury curve across all maturities: latest, or as of ?date=YYYY-MM-DD.
+    """
+    try:
+        return jsonify(get_yield_curve(request.args.get("date")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/yield_curve/history")
+def yield_curve_history():
+    try:
+        return json_response(yield_curve.history(request.args.get("start"), request.args.get("end")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/yield_curve/spreads")
+def yield_curve_spreads():
+    try:
+        return json_response(yield_curve.spreads(request.args.get("start"), request.args.get("end")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/macro_indicators/<series_id>")
+def macro_indicator_history(series_id):
+    """
+    Full stored history of a macro indicator (raw values + derived % change) for charting.
+    """
+    try:
+        if series_id not in INDICATOR_PERIODS:
+            return jsonify({"error": f"Unknown indicator: {series_id}"}), 404
+        return json_response(get_indicator(series_id).history())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/macro_box")
 def macro_box():
     try:
@@ -91,6 +307,27 @@ def macro_box():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/macro_box/image")
+def macro_box_image():
+    """
+    Serve the quadrant chart straight from memory (?format=png|svg) with an
+    ETag so browsers revalidate instead of re-downloading.
+    """
+    try:
+        fmt = request.args.get("format", "png")
+        if fmt not in MIME_TYPES:
+            return jsonify({"error": "Invalid format"}), 400
+        data = get_macro_analysis()
+        image, digest = render_macro_quadrant_box(data["growth_rate"], data["inflation_rate"], fmt)
+
+        response = Response(image, mimetype=MIME_TYPES[fmt])
+        response.set_etag(digest)
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.MACRO_IMAGE_MAX_AGE
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/market_news")
 def market_news():
     try:
@@ -98,7 +335,13 @@ def market_news():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/scheduler/status")
+def scheduler_status():
+    return jsonify({"enabled": Config.SCHEDULER_ENABLED, "jobs": scheduler.stats()})
+
 if __name__ == "__main__":
+    # Development server; see wsgi.py for the production entry point
+    create_app()
     app.run(
         debug=Config.DEBUG,
         host="0.0.0.0",
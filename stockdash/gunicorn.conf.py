@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+#
+# Settings for the production entry points (see wsgi.py). Everything is
+# driven by Config so the same environment variables configure every mode.
+
+from config import Config
+
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+timeout = Config.WEB_TIMEOUT
+
+if Config.WEB_MODE == "asgi":
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    # Threads keep one slow upstream call from blocking a whole worker
+    worker_class = "gthread"
+    threads = Config.WEB_THREADS
+
+# Each worker imports the app itself, so no sockets, threads or SQLite
+# connections are inherited across fork()
+preload_app = False
+accesslog = "-"
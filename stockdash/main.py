@@ -3,12 +3,11 @@
 import json
 import numpy as np
 import requests
-import yfinance as yf
 
 from config import Config
 from services.data_manger import DataManager
 from services.model_predictions import ModelPredictions
-from services.PTC import fetch_intraday_data, compute_statistics
+from services.PTC import get_intraday_closes, compute_statistics
 from services.fundamental import calculate_fundamental_analysis
 
 ###############################################################################
@@ -75,7 +74,7 @@ def handle_economic_data():
         print("Error fetching data from API.")
         return
 
-    X, y = DataManager.prepare_data(data)
+    X, y = DataManager.prepare_data_arrays(data)
 
     print("\nChoose the prediction model:")
     for key, value in model_choices.items():
@@ -126,7 +125,7 @@ def handle_stock_data():
 
     if choice == 1:
         try:
-            intraday_data = fetch_intraday_data(stock_symbol)
+            intraday_data = get_intraday_closes(stock_symbol)
             intervals = [30, 60, 90, 120, 150]
             stats = compute_statistics(intraday_data, intervals)
             print("\nTechnical Analysis:")
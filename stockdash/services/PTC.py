@@ -1,56 +1,343 @@
 #PTC.py
+import asyncio
+import threading
+import numpy as np
 import requests
-import statistics
-from services.data_manger import API_KEY
-# Define the API key here or import from a secure location
+from config import Config
+from services import alpha_vantage
+from services.async_http import run_blocking
+from services.bar_store import BAR_COLUMNS, bar_store, parse_time_series
 
+# Window lengths (bars) reported by the technical statistics endpoints
+TECHNICAL_INTERVALS = [30, 60, 90, 120, 150]
 
-def fetch_intraday_data(stock_symbol, interval='5min', adjusted=True, extended_hours=True, outputsize='full', datatype='json'):
-    BASE_URL = "https://www.alphavantage.co/query"
-    
-    params = {
-        'function': 'TIME_SERIES_INTRADAY',
+
+def _intraday_params(stock_symbol, interval, adjusted, extended_hours, outputsize, datatype):
+    return {
         'symbol': stock_symbol,
         'interval': interval,
         'adjusted': str(adjusted).lower(),
         'extended_hours': str(extended_hours).lower(),
         'outputsize': outputsize,
-        'datatype': datatype,
-        'apikey': API_KEY
+        'datatype': datatype
     }
 
-    response = requests.get(BASE_URL, params=params)
-    response.raise_for_status()
 
+def fetch_intraday_data(stock_symbol, interval='5min', adjusted=True, extended_hours=True, outputsize='full', datatype='json'):
     if datatype == 'json':
-        return response.json()["Time Series (5min)"]
-    else:
-        return response.text
+        return _fetch_intraday(stock_symbol, interval, adjusted, extended_hours, outputsize)[0]
+
+    params = _intraday_params(stock_symbol, interval, adjusted, extended_hours, outputsize, datatype)
+    return alpha_vantage.client.get('TIME_SERIES_INTRADAY', **params).text
+
+
+def _fetch_intraday(stock_symbol, interval='5min', adjusted=True, extended_hours=True, outputsize='full'):
+    params = _intraday_params(stock_symbol, interval, adjusted, extended_hours, outputsize, 'json')
+    response = alpha_vantage.client.get('TIME_SERIES_INTRADAY', **params)
+    return _time_series(response.json(), interval)
+
+
+def _time_series(payload, interval):
+    """
+    (time-series dict, time zone of its timestamps) from an intraday payload.
+    """
+    key = f"Time Series ({interval})"
+    if not isinstance(payload, dict) or key not in payload:
+        message = payload.get("Error Message") if isinstance(payload, dict) else None
+        raise alpha_vantage.AlphaVantageError(message or f"No {key} in TIME_SERIES_INTRADAY response")
+    return payload[key], payload.get("Meta Data", {}).get("6. Time Zone")
+
+
+async def fetch_intraday_data_async(stock_symbol, interval='5min', adjusted=True, extended_hours=True, outputsize='full'):
+    """
+    Async variant of fetch_intraday_data (JSON only) on the pooled HTTP client.
+    """
+    return (await _fetch_intraday_async(stock_symbol, interval, adjusted, extended_hours, outputsize))[0]
+
+
+async def _fetch_intraday_async(stock_symbol, interval='5min', adjusted=True, extended_hours=True, outputsize='full'):
+    payload = await alpha_vantage.client.get_json_async(
+        'TIME_SERIES_INTRADAY',
+        **_intraday_params(stock_symbol, interval, adjusted, extended_hours, outputsize, 'json')
+    )
+    return _time_series(payload, interval)
+
+
+def _refresh_plan(store, stock_symbol, interval, force=False):
+    """
+    None if the stored bars are fresh enough to serve as-is, otherwise the
+    outputsize to request ('compact' for a tail update, 'full' for a cold store).
+    force=True always refreshes.
+    """
+    age = store.age(stock_symbol, interval)
+    if not force and age is not None and age < Config.INTRADAY_REFRESH_SECONDS:
+        return None
+    if store.last_timestamp(stock_symbol, interval) is None:
+        return 'full'
+    return 'compact'
+
+
+def _has_gap(store, stock_symbol, interval, new_ts):
+    last = store.last_timestamp(stock_symbol, interval)
+    return last is not None and len(new_ts) > 0 and new_ts[0] > last
+
+
+# Failures that leave already-stored bars usable
+UPSTREAM_ERRORS = (alpha_vantage.AlphaVantageError, requests.RequestException, ValueError)
+
+# (store root, symbol, interval) -> _Refresh in progress
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class _Refresh:
+    """
+    One in-progress upstream refresh; concurrent callers wait on it.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+def _refresh_key(store, stock_symbol, interval):
+    return store.root, stock_symbol.upper(), interval
+
+
+def _serve_stored(store, stock_symbol, interval, error):
+    """
+    After a failed refresh, fall back to whatever is stored (re-raising if
+    nothing is).
+    """
+    timestamps, ohlcv = store.load(stock_symbol, interval)
+    if not len(timestamps):
+        raise error
+    print(f"[WARN] Intraday refresh failed for {stock_symbol} ({error}); serving stored bars")
+    return timestamps, ohlcv
+
+
+def _refresh_bars(store, stock_symbol, interval, outputsize):
+    try:
+        new_ts, new_bars = parse_time_series(
+            *_fetch_intraday(stock_symbol, interval, outputsize=outputsize)
+        )
+        if outputsize == 'compact' and _has_gap(store, stock_symbol, interval, new_ts):
+            # Gap between the stored history and the compact tail: backfill
+            new_ts, new_bars = parse_time_series(*_fetch_intraday(stock_symbol, interval))
+    except UPSTREAM_ERRORS as e:
+        _serve_stored(store, stock_symbol, interval, e)
+        return
+    store.append(stock_symbol, interval, new_ts, new_bars)
+
+
+def get_intraday_bars(stock_symbol, interval='5min', store=None, force=False):
+    """
+    Return (timestamps, ohlcv) arrays (oldest first) for a symbol, served from
+    the local bar store. Upstream is only hit when the stored bars are older
+    than Config.INTRADAY_REFRESH_SECONDS, and then only for the compact tail
+    (latest 100 bars) unless that tail no longer overlaps what is stored.
+
+    Concurrent callers for the same symbol share one refresh, and a failed
+    refresh (throttling, bad payload) serves the stored bars if there are any.
+    force=True refreshes even if the stored bars are still fresh (pre-warming).
+    """
+    store = store or bar_store
+    outputsize = _refresh_plan(store, stock_symbol, interval, force)
+    if outputsize is None:
+        return store.load(stock_symbol, interval)
+
+    key = _refresh_key(store, stock_symbol, interval)
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Refresh()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return store.load(stock_symbol, interval)
+
+    try:
+        _refresh_bars(store, stock_symbol, interval, outputsize)
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+    return store.load(stock_symbol, interval)
+
+
+def _load_copy(store, stock_symbol, interval):
+    # Read the memory-mapped columns into memory on the worker thread, so
+    # page faults don't land on the event loop later
+    timestamps, ohlcv = store.load(stock_symbol, interval)
+    return np.array(timestamps), np.array(ohlcv)
+
+
+# (loop, store root, symbol, interval) -> asyncio.Task refreshing it
+_async_inflight = {}
+
+
+async def _refresh_bars_async(store, stock_symbol, interval, outputsize):
+    try:
+        new_ts, new_bars = parse_time_series(
+            *await _fetch_intraday_async(stock_symbol, interval, outputsize=outputsize)
+        )
+        if outputsize == 'compact' and _has_gap(store, stock_symbol, interval, new_ts):
+            new_ts, new_bars = parse_time_series(*await _fetch_intraday_async(stock_symbol, interval))
+    except UPSTREAM_ERRORS as e:
+        await run_blocking("disk", _serve_stored, store, stock_symbol, interval, e)
+        return
+    await run_blocking("disk", store.append, stock_symbol, interval, new_ts, new_bars)
+
+
+async def get_intraday_bars_async(stock_symbol, interval='5min', store=None):
+    """
+    Async variant of get_intraday_bars. Store reads and writes run on worker
+    threads, off the event loop.
+    """
+    store = store or bar_store
+    outputsize = await run_blocking("disk", _refresh_plan, store, stock_symbol, interval)
+    if outputsize is not None:
+        key = (id(asyncio.get_running_loop()),) + _refresh_key(store, stock_symbol, interval)
+        task = _async_inflight.get(key)
+        if task is None:
+            task = _async_inflight[key] = asyncio.ensure_future(
+                _refresh_bars_async(store, stock_symbol, interval, outputsize)
+            )
+            task.add_done_callback(lambda _: _async_inflight.pop(key, None))
+        # Shielded: one caller going away must not cancel the others' refresh
+        await asyncio.shield(task)
+    return await run_blocking("disk", _load_copy, store, stock_symbol, interval)
+
+
+def _closes_newest_first(ohlcv):
+    return np.ascontiguousarray(ohlcv[::-1, BAR_COLUMNS.index("4. close")])
+
+
+def get_intraday_closes(stock_symbol, interval='5min'):
+    """
+    Closes newest first, ready for compute_statistics.
+    """
+    _, ohlcv = get_intraday_bars(stock_symbol, interval)
+    return _closes_newest_first(ohlcv)
+
+
+async def get_intraday_closes_async(stock_symbol, interval='5min'):
+    _, ohlcv = await get_intraday_bars_async(stock_symbol, interval)
+    return _closes_newest_first(ohlcv)
+
+def parse_intraday_closes(data):
+    """
+    Parse an Alpha Vantage "Time Series (5min)" payload into a contiguous
+    float64 array of closes, newest first (same order as the payload keys).
+    """
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=np.float64)
+    return np.fromiter(
+        (float(bar["4. close"]) for bar in data.values()),
+        dtype=np.float64,
+        count=len(data)
+    )
+
+
+def _running_modes(closes, sizes):
+    """
+    Single pass over closes returning {n: mode(closes[:n])} for each n in sizes.
+    Ties resolve to the value seen first, matching statistics.mode.
+    """
+    wanted = set(sizes)
+    counts, first_seen = {}, {}
+    best, best_count = None, 0
+    modes = {}
+    for i, value in enumerate(closes[:max(sizes)].tolist()):
+        count = counts.get(value, 0) + 1
+        counts[value] = count
+        first_seen.setdefault(value, i)
+        if count > best_count or (count == best_count and first_seen[value] < first_seen[best]):
+            best, best_count = value, count
+        if i + 1 in wanted:
+            modes[i + 1] = best
+    return modes
+
+
+def _window_mode(window):
+    values, first_index, counts = np.unique(window, return_index=True, return_counts=True)
+    top = counts == counts.max()
+    return float(values[top][np.argmin(first_index[top])])
+
 
 def compute_statistics(data, intervals):
-    results = {}
-    
-    for interval in intervals:
-        subset_data = [float(data[key]["4. close"]) for key in list(data.keys())[:interval]]
-        
-        # Calculate statistics
-        high = max(subset_data)
-        low = min(subset_data)
-        mean = statistics.mean(subset_data)
-        mode = statistics.mode(subset_data)
-        variance = statistics.variance(subset_data)
-        stdev = statistics.stdev(subset_data)
+    """
+    High/Low/Mean/Mode/Variance/Stdev over the most recent `interval` closes,
+    for each interval. Closes are parsed once and every window is read off
+    prefix sums, so the cost is one pass regardless of how many intervals
+    are requested. Variance is the sample variance (n - 1), as before.
+    """
+    closes = parse_intraday_closes(data)
+    sizes = [min(interval, len(closes)) for interval in intervals]
+    if not sizes:
+        return {}
+    if min(sizes) < 2:
+        raise ValueError("At least two data points are required per interval")
 
+    # Shift by the first close to keep the sum-of-squares numerically stable
+    shifted = closes[:max(sizes)] - closes[0]
+    sum1 = np.cumsum(shifted)
+    sum2 = np.cumsum(shifted * shifted)
+    running_high = np.maximum.accumulate(closes[:max(sizes)])
+    running_low = np.minimum.accumulate(closes[:max(sizes)])
+    modes = _running_modes(closes, sizes)
+
+    results = {}
+    for interval, n in zip(intervals, sizes):
+        s1, s2 = sum1[n - 1], sum2[n - 1]
+        variance = max((s2 - s1 * s1 / n) / (n - 1), 0.0)
         results[interval] = {
-            'High': high,
-            'Low': low,
-            'Mean': mean,
-            'Mode': mode,
-            'Variance': variance,
-            'Standard Deviation': stdev
+            'High': float(running_high[n - 1]),
+            'Low': float(running_low[n - 1]),
+            'Mean': float(closes[0] + s1 / n),
+            'Mode': modes[n],
+            'Variance': float(variance),
+            'Standard Deviation': float(np.sqrt(variance))
         }
     return results
 
+
+def compute_sliding_statistics(data, window, step=1):
+    """
+    Same statistics as compute_statistics, but for every `window`-bar slice
+    across the whole session (start offsets 0, step, 2*step, ...).
+    Returns a dict of equal-length lists keyed like compute_statistics' output,
+    plus 'Start' (offset of each window's newest bar).
+    """
+    closes = parse_intraday_closes(data)
+    if window < 2 or len(closes) < window:
+        raise ValueError("Window must be >= 2 and no longer than the series")
+
+    starts = np.arange(0, len(closes) - window + 1, step)
+    shifted = closes - closes[0]
+    sum1 = np.concatenate(([0.0], np.cumsum(shifted)))
+    sum2 = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    s1 = sum1[starts + window] - sum1[starts]
+    s2 = sum2[starts + window] - sum2[starts]
+    variance = np.maximum((s2 - s1 * s1 / window) / (window - 1), 0.0)
+
+    windows = np.lib.stride_tricks.sliding_window_view(closes, window)[starts]
+    return {
+        'Start': starts.tolist(),
+        'High': windows.max(axis=1).tolist(),
+        'Low': windows.min(axis=1).tolist(),
+        'Mean': (closes[0] + s1 / window).tolist(),
+        'Mode': [_window_mode(w) for w in windows],
+        'Variance': variance.tolist(),
+        'Standard Deviation': np.sqrt(variance).tolist()
+    }
+
 # Example Usage:
 if __name__ == '__main__':
     # Example stock symbol
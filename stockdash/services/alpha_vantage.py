@@ -0,0 +1,185 @@
+# services/alpha_vantage.py
+
+import asyncio
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from services import async_http
+from services.metrics import upstream_call
+from services.shared_cache import shared_cache
+
+# Payload keys Alpha Vantage uses to signal throttling instead of an HTTP error
+THROTTLE_KEYS = ("Note", "Information")
+
+
+class AlphaVantageError(Exception):
+    pass
+
+
+class RateLimitError(AlphaVantageError):
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() consumes a token and returns how long
+    the caller must wait before using it, so sync callers can sleep and async
+    callers can await asyncio.sleep for the same budget.
+    """
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 12))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+def is_throttled(payload):
+    return isinstance(payload, dict) and any(
+        key in payload and len(payload) <= 2 for key in THROTTLE_KEYS
+    )
+
+
+def has_data(payload):
+    """
+    True for a payload worth caching: not empty, not an "Error Message"
+    (e.g. unknown symbol) and not a throttle notice.
+    """
+    return (
+        isinstance(payload, dict) and bool(payload)
+        and "Error Message" not in payload and not is_throttled(payload)
+    )
+
+
+class AlphaVantageClient:
+    """
+    Shared Alpha Vantage client: pooled keep-alive session, per-call timeouts,
+    exponential backoff on HTTP 429 and "API call frequency" payloads, and a
+    token bucket sized to Config.ALPHA_VANTAGE_CALLS_PER_MINUTE.
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeout=None, max_retries=None,
+                 backoff=None, rate_per_minute=None):
+        self.api_key = api_key if api_key is not None else Config.API_KEY
+        self.base_url = base_url or Config.BASE_URL
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Config.ALPHA_VANTAGE_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else Config.ALPHA_VANTAGE_BACKOFF
+        self.bucket = TokenBucket(rate_per_minute or Config.ALPHA_VANTAGE_CALLS_PER_MINUTE)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=Config.HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def params(self, function, **kwargs):
+        params = {'function': function, 'apikey': self.api_key}
+        params.update(kwargs)
+        return params
+
+    def _backoffs(self):
+        """
+        Retry schedule shared by the sync and async paths: one entry per
+        attempt, holding the delay before the next attempt (None after the last).
+        """
+        for attempt in range(self.max_retries + 1):
+            yield self.backoff * (2 ** attempt) if attempt < self.max_retries else None
+
+    def _throttled(self, status_code, payload, params):
+        """
+        True for HTTP 429 or a throttle payload (other HTTP errors are raised
+        by the caller first). `payload` is a callable so non-JSON responses are never decoded.
+        """
+        if status_code == 429:
+            return True
+        if params.get('datatype', 'json') == 'json':
+            return is_throttled(payload())
+        return False
+
+    def _exhausted(self, function):
+        return RateLimitError(f"Alpha Vantage throttled {function} after {self.max_retries + 1} attempts")
+
+    def get(self, function, timeout=None, **kwargs):
+        """
+        Call one Alpha Vantage function and return the raw response.
+        Retries with exponential backoff while throttled; raises RateLimitError
+        once retries are exhausted.
+        """
+        params = self.params(function, **kwargs)
+        for delay in self._backoffs():
+            self.bucket.acquire()
+            with upstream_call("alpha_vantage"):
+                response = self.session.get(self.base_url, params=params, timeout=timeout or self.timeout)
+
+            if response.status_code != 429:
+                response.raise_for_status()
+            if not self._throttled(response.status_code, response.json, params):
+                return response
+            if delay is not None:
+                time.sleep(delay)
+
+        raise self._exhausted(function)
+
+    async def get_json_async(self, function, **kwargs):
+        """
+        Async variant of get_json on the pooled HTTP client, with the same
+        token bucket, throttle detection and backoff as the sync path.
+        """
+        kwargs.setdefault('datatype', 'json')
+        params = self.params(function, **kwargs)
+        for delay in self._backoffs():
+            await asyncio.sleep(self.bucket.reserve())
+            response = await async_http.fetch("alpha_vantage", self.base_url, params=params)
+
+            if response.status_code != 429:
+                response.raise_for_status()
+            if not self._throttled(response.status_code, response.json, params):
+                return response.json()
+            if delay is not None:
+                await asyncio.sleep(delay)
+
+        raise self._exhausted(function)
+
+    def get_json(self, function, timeout=None, cache_timeout=None, **kwargs):
+        """
+        JSON payload of one call. With `cache_timeout` (seconds) the payload is
+        shared across workers through the shared cache; error and throttle
+        payloads are returned but never cached.
+        """
+        kwargs.setdefault('datatype', 'json')
+        if not cache_timeout:
+            return self.get(function, timeout=timeout, **kwargs).json()
+
+        key = "alpha_vantage:" + "&".join(
+            f"{k}={v}" for k, v in sorted({'function': function, **kwargs}.items())
+        )
+        payload = shared_cache.get(key)
+        if payload is None:
+            payload = self.get(function, timeout=timeout, **kwargs).json()
+            if has_data(payload):
+                shared_cache.set(key, payload, cache_timeout)
+        return payload
+
+
+# Shared instance used by DataManager and PTC
+client = AlphaVantageClient()
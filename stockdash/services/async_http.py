@@ -0,0 +1,83 @@
+# services/async_http.py
+
+import asyncio
+
+from config import Config
+from services.metrics import upstream_call
+
+# Upstream name -> asyncio.Semaphore, created per event loop
+_semaphores = {}
+_clients = {}
+
+
+def _loop_key():
+    return id(asyncio.get_running_loop())
+
+
+def get_client():
+    """
+    Shared httpx.AsyncClient (connection pool + keep-alive) for the running loop.
+    """
+    import httpx
+
+    key = _loop_key()
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=Config.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=Config.ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.ASYNC_MAX_CONNECTIONS
+            )
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_client():
+    client = _clients.pop(_loop_key(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def upstream_slot(upstream):
+    """
+    Semaphore bounding in-flight calls to one upstream (alpha_vantage, fred,
+    yfinance, rss, disk). Limits come from Config.ASYNC_UPSTREAM_LIMITS.
+    """
+    key = (_loop_key(), upstream)
+    sem = _semaphores.get(key)
+    if sem is None:
+        limit = Config.ASYNC_UPSTREAM_LIMITS.get(upstream, 8)
+        sem = _semaphores[key] = asyncio.Semaphore(limit)
+    return sem
+
+
+async def fetch(upstream, url, params=None, headers=None):
+    """
+    GET through the upstream's concurrency slot; the status is left to the caller.
+    """
+    async with upstream_slot(upstream):
+        with upstream_call(upstream):
+            return await get_client().get(url, params=params, headers=headers)
+
+
+async def get_json(upstream, url, params=None):
+    response = await fetch(upstream, url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_response(upstream, url, headers=None):
+    response = await fetch(upstream, url, headers=headers)
+    response.raise_for_status()
+    return response
+
+
+async def run_blocking(upstream, fn, *args, **kwargs):
+    """
+    Run a blocking client call (fredapi, yfinance) or local disk I/O
+    ("disk") on a worker thread while holding the upstream's concurrency slot.
+    """
+    async with upstream_slot(upstream):
+        return await asyncio.to_thread(fn, *args, **kwargs)
@@ -0,0 +1,152 @@
+# services/bar_store.py
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from config import Config
+
+# Column order of the OHLCV matrix
+BAR_COLUMNS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+
+# Alpha Vantage reports intraday bars in US/Eastern wall-clock time
+# ("6. Time Zone" in the payload's Meta Data)
+EXCHANGE_TIME_ZONE = "America/New_York"
+
+
+def _to_utc(wall_clock, time_zone):
+    """
+    Wall-clock int64 seconds in `time_zone` -> UTC epoch seconds. The offset
+    is looked up once per distinct hour (DST switches on the hour).
+    """
+    tz = ZoneInfo(time_zone)
+    hours, inverse = np.unique(wall_clock // 3600, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(h) * 3600, timezone.utc)
+        .replace(tzinfo=tz).utcoffset().total_seconds()
+        for h in hours
+    ], dtype=np.int64)
+    return wall_clock - offsets[inverse]
+
+
+def parse_time_series(series, time_zone=EXCHANGE_TIME_ZONE):
+    """
+    Convert an Alpha Vantage time-series dict ({"2024-01-05 19:55:00": {...}})
+    into (timestamps, ohlcv) arrays sorted oldest to newest.
+    timestamps: int64 UTC seconds since epoch (the keys are wall-clock times
+    in `time_zone`)
+    ohlcv: float64 matrix with columns BAR_COLUMNS
+
+    >>> bar = {"1. open": "1", "2. high": "2", "3. low": "0.5", "4. close": "1.5", "5. volume": "10"}
+    >>> ts, _ = parse_time_series({"2024-01-05 19:55:00": bar, "2024-07-01 09:30:00": bar})
+    >>> ts.tolist()  # 2024-01-06 00:55 UTC (EST), 2024-07-01 13:30 UTC (EDT)
+    [1704502500, 1719840600]
+    """
+    if not series:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(BAR_COLUMNS)))
+
+    wall_clock = np.array(list(series.keys()), dtype="datetime64[s]").astype(np.int64)
+    timestamps = _to_utc(wall_clock, time_zone or EXCHANGE_TIME_ZONE)
+    ohlcv = np.array(
+        [[float(bar[col]) for col in BAR_COLUMNS] for bar in series.values()],
+        dtype=np.float64
+    )
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], ohlcv[order]
+
+
+class IntradayBarStore:
+    """
+    Per-symbol columnar bar store on local disk.
+
+    Each (symbol, interval) pair is two .npy files: an int64 UTC timestamp
+    column and a float64 OHLCV matrix, both sorted ascending. Reads are memory-mapped,
+    so serving a month of 5-minute bars costs no parsing at all.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or Config.BAR_STORE_DIR
+        self._lock = threading.Lock()
+
+    def _paths(self, symbol, interval):
+        # "_utc": files written before timestamps were UTC (wall clock) are ignored
+        base = os.path.join(self.root, f"{symbol.upper()}_{interval}_utc")
+        return f"{base}.ts.npy", f"{base}.ohlcv.npy"
+
+    def load(self, symbol, interval):
+        """
+        Return (timestamps, ohlcv) for a symbol, or empty arrays if nothing is stored.
+        """
+        ts_path, bars_path = self._paths(symbol, interval)
+        try:
+            timestamps = np.load(ts_path, mmap_mode="r")
+            ohlcv = np.load(bars_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return np.empty(0, dtype=np.int64), np.empty((0, len(BAR_COLUMNS)))
+        if len(timestamps) != len(ohlcv):
+            # Torn write from a crashed process; treat as empty
+            return np.empty(0, dtype=np.int64), np.empty((0, len(BAR_COLUMNS)))
+        return timestamps, ohlcv
+
+    def last_timestamp(self, symbol, interval):
+        timestamps, _ = self.load(symbol, interval)
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def age(self, symbol, interval):
+        """
+        Seconds since the stored bars were last written (None if absent).
+        """
+        ts_path, _ = self._paths(symbol, interval)
+        try:
+            return time.time() - os.path.getmtime(ts_path)
+        except OSError:
+            return None
+
+    def touch(self, symbol, interval):
+        """
+        Mark the stored bars as just refreshed without rewriting them.
+        Returns False if nothing is stored.
+        """
+        ts_path, _ = self._paths(symbol, interval)
+        try:
+            os.utime(ts_path)
+            return True
+        except OSError:
+            return False
+
+    def append(self, symbol, interval, timestamps, ohlcv):
+        """
+        Merge new bars into the store. Bars with timestamps already stored are
+        replaced (Alpha Vantage revises the latest, still-forming bar).
+        An empty update only refreshes the store's age.
+        """
+        with self._lock:
+            old_ts, old_bars = self.load(symbol, interval)
+            if not len(timestamps) and len(old_ts) and self.touch(symbol, interval):
+                return len(old_ts)
+            if len(old_ts):
+                keep = ~np.isin(old_ts, timestamps)
+                merged_ts = np.concatenate((old_ts[keep], timestamps))
+                merged_bars = np.concatenate((old_bars[keep], ohlcv))
+                order = np.argsort(merged_ts, kind="stable")
+                merged_ts, merged_bars = merged_ts[order], merged_bars[order]
+            else:
+                merged_ts, merged_bars = np.asarray(timestamps), np.asarray(ohlcv)
+
+            # Created on first write, not at import
+            os.makedirs(self.root, exist_ok=True)
+            ts_path, bars_path = self._paths(symbol, interval)
+            suffix = f".{os.getpid()}.tmp.npy"
+            np.save(bars_path + suffix, merged_bars)
+            np.save(ts_path + suffix, merged_ts)
+            # Bars first, timestamps last: age() keys off the timestamp file
+            os.replace(bars_path + suffix, bars_path)
+            os.replace(ts_path + suffix, ts_path)
+            return len(merged_ts)
+
+
+bar_store = IntradayBarStore()
@@ -0,0 +1,81 @@
+# services/batched_ols.py
+
+import numpy as np
+
+
+def _stack(series_list):
+    """
+    Pad a list of (X, y) 1-D arrays into (N, T) matrices plus a validity mask.
+    """
+    lengths = np.array([len(x) for x, _ in series_list])
+    width = lengths.max()
+    X = np.zeros((len(series_list), width))
+    Y = np.zeros((len(series_list), width))
+    mask = np.arange(width) < lengths[:, None]
+    for i, (x, y) in enumerate(series_list):
+        X[i, :len(x)] = x
+        Y[i, :len(y)] = y
+    return X, Y, mask, lengths
+
+
+def fit_trends(series_list):
+    """
+    Fit N independent single-regressor OLS models y = a + b*x in one shot.
+
+    :param series_list: list of (X, y) pairs (1-D, may differ in length, n >= 3)
+    :return: dict of length-N arrays: intercept, slope, se_intercept, se_slope,
+             r_squared, t_slope, p_slope, t_intercept, p_intercept, n
+    """
+    from scipy import stats
+
+    X, Y, mask, n = _stack(series_list)
+    if (n < 3).any():
+        raise ValueError("Each series needs at least 3 observations")
+
+    x_mean = X.sum(axis=1) / n
+    y_mean = Y.sum(axis=1) / n
+    dx = np.where(mask, X - x_mean[:, None], 0.0)
+    dy = np.where(mask, Y - y_mean[:, None], 0.0)
+
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+    syy = (dy * dy).sum(axis=1)
+
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+
+    rss = np.maximum(syy - slope * sxy, 0.0)
+    dof = n - 2
+    sigma2 = rss / dof
+    se_slope = np.sqrt(sigma2 / sxx)
+    se_intercept = np.sqrt(sigma2 * (1.0 / n + x_mean ** 2 / sxx))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = np.where(syy > 0, 1.0 - rss / syy, 0.0)
+        t_slope = slope / se_slope
+        t_intercept = intercept / se_intercept
+
+    return {
+        "intercept": intercept,
+        "slope": slope,
+        "se_intercept": se_intercept,
+        "se_slope": se_slope,
+        "r_squared": r_squared,
+        "t_slope": t_slope,
+        "p_slope": 2 * stats.t.sf(np.abs(t_slope), dof),
+        "t_intercept": t_intercept,
+        "p_intercept": 2 * stats.t.sf(np.abs(t_intercept), dof),
+        "n": n,
+    }
+
+
+def summary_at(fit, i):
+    """
+    Summary dict for model i, in the same shape as ModelPredictions.extract_summary.
+    """
+    return {
+        'R²': round(float(fit["r_squared"][i]), 4),
+        'Intercept': round(float(fit["intercept"][i]), 4),
+        'Coefficients': {'x1': round(float(fit["slope"][i]), 4)},
+        'P-values': {'x1': round(float(fit["p_slope"][i]), 4)}
+    }
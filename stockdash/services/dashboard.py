@@ -0,0 +1,81 @@
+# services/dashboard.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from config import Config
+from services.four_quadrant import get_macro_snapshot
+from services.fundamental import get_fundamental_data, merge_macro
+from services.news import get_news
+from services.PTC import TECHNICAL_INTERVALS, compute_statistics, get_intraday_closes
+from services.quadrant_visual import draw_macro_quadrant_box
+
+# Long-lived pool shared by all dashboard requests (no per-request spin-up)
+_pool = ThreadPoolExecutor(max_workers=Config.DASHBOARD_MAX_WORKERS, thread_name_prefix="dashboard")
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _technical(symbol):
+    return {"statistics": compute_statistics(get_intraday_closes(symbol), TECHNICAL_INTERVALS)}
+
+
+def _macro(macro):
+    image_path = draw_macro_quadrant_box(
+        growth=macro["growth_rate"],
+        inflation=macro["inflation_rate"]
+    )
+    return {**macro, "img": f"/{image_path}"}
+
+
+def build_dashboard(symbol):
+    """
+    Everything the main page shows for one symbol, gathered concurrently:
+    fundamentals, technical statistics, the macro quadrant (+ chart) and news.
+
+    Only independent lookups run on the shared pool; merging the macro
+    snapshot into fundamentals and drawing the chart happen on the calling
+    thread, so no pool task ever waits on another one (which could starve
+    the pool under load). Each section gets what is left of
+    Config.DASHBOARD_TIMEOUT; a failing or late section comes back as
+    {"error": ...} without failing the others.
+    """
+    symbol = symbol.strip().upper()
+    deadline = time.monotonic() + Config.DASHBOARD_TIMEOUT
+    futures = {
+        "fundamentals": _pool.submit(_timed, get_fundamental_data, symbol),
+        "technical": _pool.submit(_timed, _technical, symbol),
+        "macro": _pool.submit(_timed, get_macro_snapshot),
+        "news": _pool.submit(_timed, get_news),
+    }
+
+    payload = {"symbol": symbol, "timings_ms": {}}
+    for section, future in futures.items():
+        try:
+            payload[section], payload["timings_ms"][section] = future.result(
+                timeout=max(deadline - time.monotonic(), 0)
+            )
+        except FutureTimeout:
+            future.cancel()  # dropped if it has not started yet
+            payload[section] = {"error": f"Timed out after {Config.DASHBOARD_TIMEOUT:g}s"}
+        except Exception as e:
+            payload[section] = {"error": str(e)}
+
+    snapshot = payload["macro"]
+    if isinstance(snapshot, dict):
+        # The snapshot lookup failed: fundamentals go out without the macro fields
+        return payload
+
+    macro = snapshot.to_dict()
+    if "error" not in payload["fundamentals"]:
+        payload["fundamentals"] = merge_macro(payload["fundamentals"], macro)
+    try:
+        payload["macro"], elapsed_ms = _timed(_macro, macro)
+        payload["timings_ms"]["macro"] = round(payload["timings_ms"]["macro"] + elapsed_ms, 1)
+    except Exception as e:
+        payload["macro"] = {"error": str(e)}
+    return payload
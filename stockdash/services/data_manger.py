@@ -1,9 +1,10 @@
 # services/data_manger.py
 
 import numpy as np
-import requests
 from datetime import datetime
 from config import Config
+from services import alpha_vantage
+from services.warehouse import canonical_params, get_warehouse
 
 # Config-driven constants
 BASE_URL = Config.BASE_URL
@@ -21,16 +22,30 @@ class DataManager:
         """
         Fetch data from Alpha Vantage (or other services via BASE_URL).
         Example: function='TREASURY_YIELD', maturity='10year', interval='monthly'
+
+        Economic series ({"data": [{"date", "value"}, ...]} payloads) are kept
+        in the local warehouse and served from it until they are older than
+        Config.WAREHOUSE_ECONOMIC_TTL.
         """
-        params = {
-            'function': function,
-            'apikey': API_KEY,
-            'datatype': 'json'
-        }
-        params.update(kwargs)
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        return response.json()
+        kwargs.setdefault('cache_timeout', Config.CACHE_DEFAULT_TIMEOUT)
+        warehouse = get_warehouse()
+        if warehouse is None:
+            return alpha_vantage.client.get_json(function, **kwargs)
+
+        params = canonical_params(kwargs)
+        if warehouse.is_fresh(warehouse.synced_at("economic", f"{function}?{params}"),
+                              Config.WAREHOUSE_ECONOMIC_TTL):
+            payload = warehouse.economic_payload(function, params)
+            if payload is not None:
+                return payload
+            if warehouse.offline:
+                raise LookupError(f"{function} ({params}) is not in the warehouse (WAREHOUSE_OFFLINE is set)")
+
+        payload = alpha_vantage.client.get_json(function, **kwargs)
+        if isinstance(payload.get('data'), list):
+            warehouse.upsert_economic(function, params, payload)
+            warehouse.mark_synced("economic", f"{function}?{params}")
+        return payload
 
     def normalize(self, values):
         """
@@ -88,16 +103,35 @@ class DataManager:
 
         return X, y
 
+    @staticmethod
+    def prepare_data_arrays(data):
+        """
+        Vectorized prepare_data: same X (days / 30 relative to the most recent
+        observation) and y, but as contiguous float64 arrays.
+        Dates ('YYYY-MM-DD' or 'YYYY') are parsed with a single datetime64
+        conversion instead of strptime per row.
+        """
+        raw = data['data']
+        dates = np.array([entry['date'] for entry in raw], dtype='datetime64[D]')
+        values = np.array([entry['value'] for entry in raw], dtype=np.float64)
+
+        order = np.argsort(dates, kind='stable')  # Oldest to newest
+        dates, values = dates[order], values[order]
+
+        X = (dates - dates[-1]).astype(np.float64) / 30
+        return np.ascontiguousarray(X), np.ascontiguousarray(values)
+
+    def _normalize_array(self, values):
+        self.min_val, self.max_val = values.min(), values.max()
+        return (values - self.min_val) / (self.max_val - self.min_val)
+
     def preprocess(self, data):
         """
         Same as prepare_data but normalized and reshaped for ML models like sklearn.
         Returns: normalized time (X), normalized values (y)
         """
-        X_raw, y_raw = self.prepare_data(data)
-        X_scaled = self.normalize(X_raw)
-        y_scaled = self.normalize(y_raw)
-
-        return (
-            np.array(X_scaled).reshape(-1, 1),
-            np.array(y_scaled).reshape(-1, 1)
-        )
+        X_raw, y_raw = self.prepare_data_arrays(data)
+        X_scaled = self._normalize_array(X_raw)
+        y_scaled = self._normalize_array(y_raw)
+
+        return X_scaled.reshape(-1, 1), y_scaled.reshape(-1, 1)
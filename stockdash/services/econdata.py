@@ -5,17 +5,38 @@ import logging
 from services.data_manger import API_KEY
 # services/econdata.py
 
-from fredapi import Fred
-from config import Config
+from services.async_http import run_blocking
+from services.fred_cache import fred_cache
+from services.macro_indicators import get_indicator
+
+# Treasury constant-maturity yields (monthly), shortest to longest
+MATURITY_MAP = {
+    "3m": "GS3M",
+    "6m": "GS6M",
+    "1y": "GS1",
+    "2y": "GS2",
+    "3y": "GS3",
+    "5y": "GS5",
+    "7y": "GS7",
+    "10y": "GS10",
+    "20y": "GS20",
+    "30y": "GS30"
+}
 
 class EconomicDataFetcher:
-    def __init__(self):
-        self.fred = Fred(api_key=Config.FRED_API_KEY)
+    def __init__(self, cache=fred_cache):
+        # Series are served from the shared process-wide cache
+        self.fred = cache
 
     def get_cpi_yoy(self, periods=12):
         """
         Fetch CPI YoY % from CPIAUCSL.
         """
+        if periods == 12 and self.fred is fred_cache:
+            # Maintained incrementally; no full-history pct_change per call
+            _, cpi_yoy = get_indicator("CPIAUCSL", periods=12).latest_change()
+            return round(cpi_yoy, 2)
+
         series = self.fred.get_series("CPIAUCSL")
         cpi_yoy = series.pct_change(periods=periods) * 100
         return round(cpi_yoy.dropna().iloc[-1], 2)
@@ -25,19 +46,7 @@ class EconomicDataFetcher:
         Fetch real-time Treasury Yield based on maturity.
         Accepted: 3m, 6m, 1y, 2y, 3y, 5y, 7y, 10y, 20y, 30y
         """
-        maturity_map = {
-            "3m": "GS3M",
-            "6m": "GS6M",
-            "1y": "GS1",
-            "2y": "GS2",
-            "3y": "GS3",
-            "5y": "GS5",
-            "7y": "GS7",
-            "10y": "GS10",
-            "20y": "GS20",
-            "30y": "GS30"
-        }
-        code = maturity_map.get(maturity.lower())
+        code = MATURITY_MAP.get(maturity.lower())
         if not code:
             raise ValueError(f"Unsupported maturity: {maturity}")
         series = self.fred.get_series(code)
@@ -58,6 +67,17 @@ class EconomicDataFetcher:
         series = self.fred.get_series(code)
         return round(series.dropna().iloc[-1], 2)
 
+    # --- async variants (FRED calls run on worker threads) ---
+
+    async def get_cpi_yoy_async(self, periods=12):
+        return await run_blocking("fred", self.get_cpi_yoy, periods)
+
+    async def get_treasury_yield_async(self, maturity="10y"):
+        return await run_blocking("fred", self.get_treasury_yield, maturity)
+
+    async def get_fed_funds_rate_async(self, interval="monthly"):
+        return await run_blocking("fred", self.get_fed_funds_rate, interval)
+
     def format_macro_data(self, cpi, fed, treasury):
         return (
             f"### Macro Summary\n"
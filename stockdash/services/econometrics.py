@@ -1,12 +1,17 @@
-import yfinance as yf
-import pandas as pd
-import statsmodels.api as sm
+# yfinance / pandas / statsmodels are imported on first use to keep startup fast.
 from datetime import datetime, timedelta
 
+from services.price_history import price_history
+
 
 def run_ols_model(stock_symbol: str, index_symbol: str = "^GSPC", period="6mo"):
-  stock = yf.download(stock_symbol, period=period)["Adj Close"]
-  index = yf.download(index_symbol, period=period)["Adj Close"]
+  import pandas as pd
+  import statsmodels.api as sm
+
+  # One coalesced multi-ticker download (adjusted closes)
+  closes = price_history.closes([stock_symbol, index_symbol], period=period)
+  stock = closes[stock_symbol]
+  index = closes[index_symbol]
 
   df = pd.DataFrame({
       "stock": stock.pct_change().dropna(),
@@ -23,10 +28,10 @@ def run_ols_model(stock_symbol: str, index_symbol: str = "^GSPC", period="6mo"):
   }
 
 
-from statsmodels.tsa.arima.model import ARIMA
-
 def run_arima_forecast(stock_symbol: str, period="3mo"):
-    stock = yf.download(stock_symbol, period=period)["Adj Close"].dropna()
+    from statsmodels.tsa.arima.model import ARIMA
+
+    stock = price_history.get(stock_symbol, period=period)["Close"].dropna()
 
     # Fit ARIMA(p,d,q) model (keep simple: ARIMA(1,1,1))
     model = ARIMA(stock, order=(1, 1, 1))
@@ -38,3 +43,69 @@ def run_arima_forecast(stock_symbol: str, period="3mo"):
         "next_day_forecast": forecast.iloc[0],
         "model_summary": fitted_model.summary().as_text()
     }
+
+
+def download_returns(symbols, index_symbol="^GSPC", period="1y"):
+    """
+    One multi-ticker download for the universe plus the benchmark (via the
+    shared price-history provider). Returns a DataFrame of daily simple
+    returns, one column per ticker.
+    """
+    tickers = list(dict.fromkeys([*symbols, index_symbol]))
+    prices = price_history.closes(tickers, period=period)
+    return prices.pct_change().iloc[1:]
+
+
+def rolling_alpha_beta(returns, index_symbol="^GSPC", window=60):
+    """
+    Rolling single-factor regression of every column on the benchmark column,
+    computed from rolling moments (no per-window OLS fit):
+        beta  = cov(r, m) / var(m)
+        alpha = mean(r) - beta * mean(m)
+        R²    = corr(r, m)²
+    Returns {"alpha", "beta", "r_squared"} DataFrames (dates x symbols).
+    """
+    market = returns[index_symbol]
+    stocks = returns.drop(columns=[index_symbol])
+    rolling = stocks.rolling(window, min_periods=window)
+
+    beta = rolling.cov(market).div(market.rolling(window).var(), axis=0)
+    alpha = rolling.mean() - beta.mul(market.rolling(window).mean(), axis=0)
+    r_squared = rolling.corr(market) ** 2
+    return {"alpha": alpha, "beta": beta, "r_squared": r_squared}
+
+
+def run_rolling_ols_universe(symbols, index_symbol="^GSPC", period="1y", window=60, decimals=6):
+    """
+    Rolling alpha/beta/R² for many symbols against one benchmark, as compact
+    arrays: {"dates": [epoch ms], "symbols": {sym: {"alpha": [...], ...}}}.
+    Symbols missing from the download come back under "errors".
+    """
+    import numpy as np
+
+    returns = download_returns(symbols, index_symbol, period)
+    frames = rolling_alpha_beta(returns, index_symbol, window)
+
+    # Drop the warm-up rows where no window is complete yet
+    valid = frames["beta"].notna().any(axis=1)
+    dates = frames["beta"].index[valid]
+
+    result = {
+        "index": index_symbol,
+        "window": window,
+        "dates": (dates.asi8 // 10**6).tolist(),
+        "symbols": {},
+        "errors": {}
+    }
+    for symbol in symbols:
+        if symbol not in frames["beta"].columns or frames["beta"][symbol].isna().all():
+            result["errors"][symbol] = "No price data"
+            continue
+        result["symbols"][symbol] = {
+            name: [
+                None if np.isnan(v) else v
+                for v in np.round(frame.loc[valid, symbol].to_numpy(dtype=float), decimals).tolist()
+            ]
+            for name, frame in frames.items()
+        }
+    return result
@@ -0,0 +1,190 @@
+# services/forecasting.py
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from services.price_history import price_history
+
+
+def _fit_worker(symbol, values, first_date, last_date, order, start_params):
+    """
+    Fit one ARIMA model. Runs in a worker process, so it only receives plain
+    Python / NumPy data and returns a plain dict.
+    """
+    import warnings
+
+    import numpy as np
+    from statsmodels.tsa.arima.model import ARIMA
+
+    start = time.perf_counter()
+    values = np.asarray(values, dtype=float)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = ARIMA(values, order=tuple(order))
+        fitted = model.fit(start_params=np.asarray(start_params) if start_params is not None else None)
+
+    return {
+        "symbol": symbol,
+        "order": list(order),
+        "first_date": first_date,
+        "last_date": last_date,
+        "latest_price": float(values[-1]),
+        "next_day_forecast": float(fitted.forecast(steps=1)[0]),
+        "params": [float(p) for p in fitted.params],
+        "aic": float(fitted.aic),
+        "warm_start": start_params is not None,
+        "fit_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+class ForecastCache:
+    """
+    Fitted ARIMA results keyed by (symbol, order, period), persisted as JSON.
+    An entry is a hit only while the input still spans the same first and
+    last bar dates. Its parameters warm-start the refit once new bars arrive.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.FORECAST_CACHE_PATH
+        self._lock = threading.Lock()
+        self._results = {}
+        self._load()
+
+    @staticmethod
+    def _key(symbol, order, period):
+        # One entry per (symbol, order, period); its first/last dates decide hits
+        return f"{symbol}|{','.join(str(o) for o in order)}|{period}"
+
+    def _load(self):
+        try:
+            with open(self.path) as fh:
+                self._results = json.load(fh)
+        except (OSError, ValueError):
+            self._results = {}
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self._results)
+        # Unique per thread: concurrent batches in one worker save at the same time
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as fh:
+            fh.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def get(self, symbol, order, period, first_date, last_date):
+        with self._lock:
+            latest = self._results.get(self._key(symbol, order, period))
+        if (latest is not None and latest.get("first_date") == first_date
+                and latest["last_date"] == last_date):
+            return latest
+        return None
+
+    def warm_params(self, symbol, order, period):
+        with self._lock:
+            latest = self._results.get(self._key(symbol, order, period))
+        return latest["params"] if latest is not None else None
+
+    def put(self, result):
+        with self._lock:
+            self._results[self._key(result["symbol"], result["order"], result["period"])] = result
+
+
+forecast_cache = ForecastCache()
+
+# Worker processes shared by every request, started on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(reset=False):
+    global _pool
+    with _pool_lock:
+        if reset and _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            # Never fork the server process itself: its scheduler, news and
+            # SQLite threads could leave locks held in the child
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.FORECAST_MAX_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _pool
+
+
+def _submit(pool, jobs):
+    return {pool.submit(_fit_worker, *job): job[0] for job in jobs}
+
+
+def forecast_many(symbols, order=(1, 1, 1), period="3mo", cache=None, prices=None):
+    """
+    One-step ARIMA forecasts for many symbols.
+
+    - Prices for the whole universe come from one multi-ticker download
+      (or pass a `prices` DataFrame, dates x symbols).
+    - Symbols whose input spans the same first and last bar dates as the
+      cached fit for (symbol, order, period) are served from the cache.
+    - The rest are fitted in the shared process pool, warm-started from the
+      previous parameters for (symbol, order, period) when available.
+
+    Returns {"results": {symbol: {...}}, "errors": {symbol: msg}, "cached": [...]}.
+    """
+    cache = cache or forecast_cache
+    order = tuple(order)
+
+    if prices is None:
+        prices = price_history.closes(symbols, period=period)
+
+    results, errors, cached, jobs = {}, {}, [], []
+    for symbol in symbols:
+        if symbol not in prices.columns:
+            errors[symbol] = "No price data"
+            continue
+        series = prices[symbol].dropna()
+        if len(series) < 10:
+            errors[symbol] = "Not enough price history"
+            continue
+
+        first_date = series.index[0].strftime("%Y-%m-%d")
+        last_date = series.index[-1].strftime("%Y-%m-%d")
+        hit = cache.get(symbol, order, period, first_date, last_date)
+        if hit is not None:
+            results[symbol] = hit
+            cached.append(symbol)
+            continue
+        jobs.append((symbol, series.to_numpy(), first_date, last_date, order,
+                     cache.warm_params(symbol, order, period)))
+
+    if jobs:
+        try:
+            futures = _submit(_get_pool(), jobs)
+        except BrokenProcessPool:
+            # A worker died during an earlier batch; start a fresh pool
+            futures = _submit(_get_pool(reset=True), jobs)
+        broken = False
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                broken |= isinstance(e, BrokenProcessPool)
+                errors[symbol] = str(e)
+                continue
+            result["period"] = period
+            cache.put(result)
+            results[symbol] = result
+        if broken:
+            _get_pool(reset=True)
+        cache.save()
+
+    return {"results": results, "errors": errors, "cached": cached}
@@ -1,11 +1,22 @@
 # four_quadrant.py
 
+import threading
 from datetime import datetime
 
 # services/four_quadrant.py
 
-from fredapi import Fred
-from config import Config
+from services.async_http import run_blocking
+from services.macro_indicators import get_indicator
+
+GDP_SERIES = "A191RL1Q225SBEA"  # Real GDP YoY % (quarterly, already a rate)
+CPI_SERIES = "CPIAUCSL"         # Consumer Price Index (monthly index)
+
+
+def _macro_indicators():
+    """
+    Return the incrementally maintained (GDP growth, CPI YoY) indicators.
+    """
+    return get_indicator(GDP_SERIES), get_indicator(CPI_SERIES, periods=12)
 
 
 def fetch_latest_macro_data():
@@ -14,16 +25,9 @@ def fetch_latest_macro_data():
     - GDP: YoY real GDP growth (quarterly annualized %)
     - CPI: YoY CPI % change (monthly)
     """
-    fred = Fred(api_key=Config.FRED_API_KEY)
-
-    # Real GDP YoY Annual Rate (Quarterly)
-    gdp_series = fred.get_series("A191RL1Q225SBEA")  # Real GDP YoY %
-    latest_gdp = gdp_series.dropna().iloc[-1]
-
-    # CPI YoY % (Monthly)
-    cpi_raw = fred.get_series("CPIAUCSL")  # Consumer Price Index
-    cpi_yoy = cpi_raw.pct_change(periods=12) * 100
-    latest_cpi = cpi_yoy.dropna().iloc[-1]
+    gdp, cpi = _macro_indicators()
+    _, latest_gdp = gdp.latest()
+    _, latest_cpi = cpi.latest_change()
 
     return float(latest_gdp), float(latest_cpi)
 
@@ -47,19 +51,100 @@ def determine_quad(growth_rate, inflation_rate):
         return "Quad 4", "Growth ↓ / Inflation ↑"
 
 
+class MacroSnapshot:
+    """
+    Immutable view of the macro quadrant computed from one pair of FRED observations.
+
+    `version` increases only when a new GDP or CPI observation lands or FRED
+    revises the latest one, so callers (batch jobs, image caches) can key
+    derived work off it.
+    """
+
+    def __init__(self, version, growth_rate, inflation_rate, gdp_as_of, cpi_as_of):
+        self.version = version
+        self.growth_rate = round(growth_rate, 2)
+        self.inflation_rate = round(inflation_rate, 2)
+        self.quadrant, self.description = determine_quad(growth_rate, inflation_rate)
+        self.gdp_as_of = gdp_as_of
+        self.cpi_as_of = cpi_as_of
+        self.computed_at = datetime.utcnow()
+
+    def to_dict(self):
+        return {
+            "growth_rate": self.growth_rate,
+            "inflation_rate": self.inflation_rate,
+            "quadrant": self.quadrant,
+            "description": self.description
+        }
+
+
+_snapshot = None
+_snapshot_sources = (None, None)
+_snapshot_inputs = None
+_snapshot_lock = threading.Lock()
+
+
+def get_macro_snapshot():
+    """
+    Return the shared MacroSnapshot, recomputing it only when the latest
+    GDP or CPI observation changed: a newer date or a revised value.
+    """
+    global _snapshot, _snapshot_sources, _snapshot_inputs
+
+    gdp, cpi = _macro_indicators()
+    gdp_as_of, growth_rate = gdp.latest()
+    cpi_as_of, inflation_rate = cpi.latest_change()
+
+    with _snapshot_lock:
+        # Same indicator revisions as last time -> nothing upstream changed
+        sources = (gdp.revision, cpi.revision)
+        if _snapshot is not None and _snapshot_sources == sources:
+            return _snapshot
+
+        inputs = (gdp_as_of, growth_rate, cpi_as_of, inflation_rate)
+        if _snapshot is None or _snapshot_inputs != inputs:
+            version = _snapshot.version + 1 if _snapshot is not None else 1
+            _snapshot = MacroSnapshot(
+                version,
+                growth_rate,
+                inflation_rate,
+                gdp_as_of,
+                cpi_as_of
+            )
+            _snapshot_inputs = inputs
+
+        _snapshot_sources = sources
+        return _snapshot
+
+
+async def get_macro_snapshot_async():
+    return await run_blocking("fred", get_macro_snapshot)
+
+
+def invalidate_macro_snapshot(refetch=True):
+    """
+    Drop the current snapshot (and optionally ask FRED for new observations
+    right away) so the next get_macro_snapshot() call picks up new releases.
+    """
+    global _snapshot_sources
+
+    if refetch:
+        # A forced refresh also replaces the cached FRED series
+        for indicator in _macro_indicators():
+            indicator.refresh(force=True)
+    with _snapshot_lock:
+        _snapshot_sources = (None, None)
+
+
 def get_macro_analysis():
     """
     Pull real-time GDP & CPI from FRED and classify macro quadrant.
     """
-    growth_rate, inflation_rate = fetch_latest_macro_data()
-    quadrant, description = determine_quad(growth_rate, inflation_rate)
-
-    return {
-        "growth_rate": round(growth_rate, 2),
-        "inflation_rate": round(inflation_rate, 2),
-        "quadrant": quadrant,
-        "description": description
-    }
+    return get_macro_snapshot().to_dict()
+
+
+async def get_macro_analysis_async():
+    return (await get_macro_snapshot_async()).to_dict()
 
 
 # === CLI Test Mode ===
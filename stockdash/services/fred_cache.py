@@ -0,0 +1,288 @@
+# services/fred_cache.py
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from config import Config
+from services.metrics import register_cache, upstream_call
+from services.warehouse import get_warehouse
+
+# Seconds a cached series stays fresh, keyed by how often FRED publishes it.
+FREQUENCY_TTLS = {
+    "daily": 60 * 60,
+    "weekly": 6 * 60 * 60,
+    "monthly": 12 * 60 * 60,
+    "quarterly": 24 * 60 * 60,
+}
+
+SERIES_FREQUENCY = {
+    "A191RL1Q225SBEA": "quarterly",
+    "CPIAUCSL": "monthly",
+    "FEDFUNDS": "monthly",
+    "WDFRAL": "weekly",
+    "DFF": "daily",
+    "GS3M": "monthly",
+    "GS6M": "monthly",
+    "GS1": "monthly",
+    "GS2": "monthly",
+    "GS3": "monthly",
+    "GS5": "monthly",
+    "GS7": "monthly",
+    "GS10": "monthly",
+    "GS20": "monthly",
+    "GS30": "monthly",
+}
+
+
+def ttl_for(series_id):
+    """
+    Return the TTL (seconds) for a FRED series based on its release frequency.
+    Unknown series fall back to Config.CACHE_DEFAULT_TIMEOUT.
+    """
+    frequency = SERIES_FREQUENCY.get(series_id)
+    return FREQUENCY_TTLS.get(frequency, Config.CACHE_DEFAULT_TIMEOUT)
+
+
+class _Flight:
+    """
+    One in-progress upstream fetch; waiters read the leader's outcome.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class FredSeriesCache:
+    """
+    Process-wide cache of FRED series.
+
+    - In-memory LRU of (fetched_at, series) entries
+    - Optional on-disk pickle tier (survives restarts)
+    - Per-series TTLs (see ttl_for)
+    - Single-flight: concurrent misses on the same series share one upstream fetch
+    """
+
+    def __init__(self, max_entries=64, cache_dir=None, fetcher=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._fetcher = fetcher
+        self._fred = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    # --- upstream ---------------------------------------------------------
+
+    def _fetch_upstream(self, series_id, **kwargs):
+        if self._fetcher is not None:
+            return self._fetcher(series_id, **kwargs)
+        if self._fred is None:
+            from fredapi import Fred
+            self._fred = Fred(api_key=Config.FRED_API_KEY)
+        with upstream_call("fred"):
+            return self._fred.get_series(series_id, **kwargs)
+
+    def _load(self, series_id, force=False):
+        """
+        Full series via the local warehouse when enabled: only observations
+        from Config.WAREHOUSE_FRED_REVISION_DAYS before the last stored date
+        onward are requested upstream (the whole history on first use), so
+        recent revisions overwrite the stored values; nothing at all is
+        requested while the stored copy is younger than the series' TTL (or
+        ever, in offline mode).
+        """
+        warehouse = get_warehouse()
+        if warehouse is None:
+            return self._fetch_upstream(series_id)
+
+        synced_at = warehouse.synced_at("fred", series_id)
+        if (force and not warehouse.offline) or not warehouse.is_fresh(synced_at, ttl_for(series_id)):
+            last = warehouse.last_series_date(series_id)
+            kwargs = {}
+            if last:
+                since = date.fromisoformat(last) - timedelta(days=Config.WAREHOUSE_FRED_REVISION_DAYS)
+                kwargs["observation_start"] = since.isoformat()
+            warehouse.upsert_series(series_id, self._fetch_upstream(series_id, **kwargs))
+            warehouse.mark_synced("fred", series_id)
+
+        series = warehouse.series(series_id)
+        if series.empty and warehouse.offline:
+            raise LookupError(f"{series_id} is not in the warehouse (WAREHOUSE_OFFLINE is set)")
+        return series
+
+    # --- disk tier --------------------------------------------------------
+
+    def _disk_path(self, series_id):
+        return os.path.join(self.cache_dir, f"{series_id}.pkl")
+
+    def _read_disk(self, series_id):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(series_id)
+        try:
+            with open(path, "rb") as fh:
+                return pickle.load(fh)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _write_disk(self, series_id, entry):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(series_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # Created on first write, not at import
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Could not write FRED cache file for {series_id}: {e}")
+
+    # --- memory tier ------------------------------------------------------
+
+    def _store(self, series_id, entry):
+        # Caller must hold self._lock
+        self._entries[series_id] = entry
+        self._entries.move_to_end(series_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fresh(self, series_id, entry):
+        return entry is not None and time.time() - entry[0] < ttl_for(series_id)
+
+    # --- public API -------------------------------------------------------
+
+    def get_series(self, series_id, force=False):
+        """
+        Return the full pandas Series for a FRED series id, fetching upstream
+        only when neither the memory nor disk tier has a fresh copy.
+        force=True skips both tiers and refreshes now (joining a fetch that
+        is already in flight rather than starting a second one).
+        """
+        with self._lock:
+            entry = self._entries.get(series_id)
+            if not force and self._fresh(series_id, entry):
+                self._entries.move_to_end(series_id)
+                self.hits += 1
+                return entry[1]
+
+            flight = self._inflight.get(series_id)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[series_id] = _Flight()
+
+        if not leader:
+            # Another thread is already fetching this series; wait for it.
+            flight.done.wait()
+            if flight.error is not None:
+                # Share the leader's failure instead of retrying upstream in turn
+                raise flight.error
+            with self._lock:
+                entry = self._entries.get(series_id)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[1]
+            # Evicted before we could read it; look again.
+            return self.get_series(series_id)
+
+        try:
+            entry = None if force else self._read_disk(series_id)
+            if self._fresh(series_id, entry):
+                with self._lock:
+                    self.disk_hits += 1
+                    self.hits += 1
+                    self._store(series_id, entry)
+                return entry[1]
+
+            series = self._load(series_id, force=force)
+            entry = (time.time(), series)
+            with self._lock:
+                self.misses += 1
+                self._store(series_id, entry)
+            self._write_disk(series_id, entry)
+            return series
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(series_id, None)
+            flight.done.set()
+
+    def prefetch(self, series_id, margin=0.1):
+        """
+        Refresh a series in the background path before it expires: if less than
+        `margin` of its TTL remains (or it is missing), fetch upstream now and
+        swap the new copy in. Readers keep getting the old copy meanwhile.
+        Returns True if an upstream fetch happened.
+        """
+        with self._lock:
+            entry = self._entries.get(series_id)
+        if entry is not None and time.time() - entry[0] < ttl_for(series_id) * (1 - margin):
+            return False
+
+        self.get_series(series_id, force=True)
+        return True
+
+    def get_observations(self, series_id, start=None, force=False):
+        """
+        Observations dated on or after `start` (all of them when None), served
+        like get_series(): from the cache tiers when fresh, with force=True
+        refreshing first. This is how incremental consumers ask for "what is
+        new since my last date" without going around the cache.
+        """
+        series = self.get_series(series_id, force=force)
+        return series.loc[start:] if start is not None else series
+
+    def invalidate(self, series_id=None):
+        """
+        Drop one series (or everything) from both tiers.
+        """
+        with self._lock:
+            ids = [series_id] if series_id else list(self._entries)
+            for sid in ids:
+                self._entries.pop(sid, None)
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            if series_id is None:
+                ids = [
+                    name[:-4] for name in os.listdir(self.cache_dir)
+                    if name.endswith(".pkl")
+                ]
+            for sid in ids:
+                try:
+                    os.remove(self._disk_path(sid))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+# Shared instance used by econdata.py and four_quadrant.py
+fred_cache = FredSeriesCache(
+    max_entries=Config.FRED_CACHE_MAX_ENTRIES,
+    cache_dir=Config.FRED_CACHE_DIR or None,
+)
+
+register_cache("fred", fred_cache.stats)
+
+
+def get_series(series_id):
+    return fred_cache.get_series(series_id)
@@ -1,26 +1,92 @@
 # services/fundamental.py
 
-import requests
-import json
-import matplotlib.pyplot as plt
-from config import Config
-from services.four_quadrant import get_macro_analysis
+# yfinance and matplotlib are imported inside the functions that use them,
+# so importing this module (and fmain.py) stays fast.
 
-import yfinance as yf
-import matplotlib.pyplot as plt
+import asyncio
 import json
-from services.four_quadrant import get_macro_analysis
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import Config
+from services.four_quadrant import get_macro_snapshot, get_macro_snapshot_async
+from services.async_http import run_blocking
+from services.metrics import register_cache, upstream_call
+from services.shared_cache import shared_cache
+from services.warehouse import get_warehouse
+
+
+# symbol -> (fetched_at, data); successful lookups only
+_fundamentals_cache = {}
+_fundamentals_lock = threading.Lock()
+_fundamentals_stats = {"hits": 0, "misses": 0}
+
+
+def _fundamentals_cache_stats():
+    with _fundamentals_lock:
+        return dict(_fundamentals_stats)
+
+
+register_cache("fundamentals", _fundamentals_cache_stats)
 
 
-def get_fundamental_data(symbol):
+def get_fundamental_data(symbol, refresh=False):
     """
     Get comprehensive real-time stock data using yfinance.
     Returns dict with EPS, Revenue, FCF, ROE, etc.
+    Results are cached for Config.FUNDAMENTAL_CACHE_TTL seconds (in process
+    and in the cross-worker shared cache) and every fetch is stored as a
+    snapshot in the warehouse;
+    refresh=True bypasses the cache (used by the pre-warm scheduler) and is
+    ignored in offline mode, where nothing is fetched upstream.
     """
+    warehouse = get_warehouse()
+    if refresh and warehouse is not None and warehouse.offline:
+        refresh = False
+
+    if not refresh:
+        with _fundamentals_lock:
+            entry = _fundamentals_cache.get(symbol)
+        if entry is None or time.time() - entry[0] >= Config.FUNDAMENTAL_CACHE_TTL:
+            # Another worker may have fetched it already
+            entry = shared_cache.get(f"fundamentals:{symbol}")
+            if entry is not None:
+                with _fundamentals_lock:
+                    _fundamentals_cache[symbol] = entry
+        hit = entry is not None and time.time() - entry[0] < Config.FUNDAMENTAL_CACHE_TTL
+        with _fundamentals_lock:
+            _fundamentals_stats["hits" if hit else "misses"] += 1
+        if hit:
+            return entry[1]
+
+        # Latest stored snapshot (the only source in offline mode)
+        if warehouse is not None:
+            entry = warehouse.latest_fundamentals(symbol)
+            if entry is not None and warehouse.is_fresh(entry[0], Config.FUNDAMENTAL_CACHE_TTL):
+                with _fundamentals_lock:
+                    _fundamentals_cache[symbol] = entry
+                return entry[1]
+            if warehouse.offline:
+                return {"error": f"No stored fundamentals for {symbol} (WAREHOUSE_OFFLINE is set)"}
+
+    data = _fetch_fundamental_data(symbol)
+    if "error" not in data:
+        entry = (time.time(), data)
+        with _fundamentals_lock:
+            _fundamentals_cache[symbol] = entry
+        shared_cache.set(f"fundamentals:{symbol}", entry, Config.FUNDAMENTAL_CACHE_TTL)
+        if warehouse is not None:
+            warehouse.add_fundamentals(symbol, data)
+    return data
+
+
+def _fetch_fundamental_data(symbol):
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
+        import yfinance as yf
+
+        with upstream_call("yfinance"):
+            stock = yf.Ticker(symbol)
+            info = stock.info
 
         return {
             "Symbol": symbol,
@@ -42,13 +108,18 @@ def get_fundamental_data(symbol):
         return {"error": str(e)}
 
 
-def calculate_fundamental_analysis(symbol):
+async def get_fundamental_data_async(symbol):
     """
-    Merge stock data with real-time macro quadrant analysis.
+    Async variant of get_fundamental_data (yfinance runs on a worker thread,
+    bounded by the yfinance upstream limit).
     """
-    fundamentals = get_fundamental_data(symbol)
-    macro = get_macro_analysis()
+    return await run_blocking("yfinance", get_fundamental_data, symbol)
+
 
+def merge_macro(fundamentals, macro):
+    """
+    Attach a macro snapshot dict (MacroSnapshot.to_dict()) to a fundamentals result.
+    """
     return {
         **fundamentals,
         "Quadrant": macro["quadrant"],
@@ -58,10 +129,88 @@ def calculate_fundamental_analysis(symbol):
     }
 
 
+def calculate_fundamental_analysis(symbol, macro=None):
+    """
+    Merge stock data with real-time macro quadrant analysis.
+    The macro side comes from the shared snapshot, so only the equity lookup
+    runs per symbol. Pass `macro` to reuse a snapshot dict across a batch.
+    """
+    fundamentals = get_fundamental_data(symbol)
+    if macro is None:
+        macro = get_macro_snapshot().to_dict()
+
+    return merge_macro(fundamentals, macro)
+
+
+async def calculate_fundamental_analysis_async(symbol):
+    fundamentals, snapshot = await asyncio.gather(
+        get_fundamental_data_async(symbol),
+        get_macro_snapshot_async()
+    )
+    macro = snapshot.to_dict()
+
+    return merge_macro(fundamentals, macro)
+
+
+def iter_fundamental_data(symbols, max_workers=None, macro=None, refresh=False):
+    """
+    Fetch fundamentals for many symbols on a bounded thread pool.
+    Yields (symbol, result, elapsed_ms) as each lookup completes, so callers
+    can stream partial results. Per-symbol failures come back as
+    {"error": ...} results instead of aborting the batch.
+    If `macro` is given it is merged into every result.
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    if not symbols:
+        return
+    max_workers = min(max_workers or Config.FUNDAMENTAL_MAX_WORKERS, len(symbols))
+
+    def timed_fetch(symbol):
+        start = time.perf_counter()
+        try:
+            result = get_fundamental_data(symbol, refresh=refresh)
+        except Exception as e:
+            result = {"error": str(e)}
+        return result, round((time.perf_counter() - start) * 1000, 1)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(timed_fetch, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            result, elapsed_ms = future.result()
+            if macro is not None and "error" not in result:
+                result = merge_macro(result, macro)
+            yield symbol, result, elapsed_ms
+    finally:
+        # A consumer that stops early (e.g. a disconnected streaming client)
+        # drops the lookups not yet started instead of waiting on them
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_fundamental_data_many(symbols, max_workers=None, macro=None, refresh=False):
+    """
+    Batch version of get_fundamental_data.
+    Returns {"results": {symbol: data}, "errors": {symbol: msg}, "timings_ms": {symbol: ms}}.
+    """
+    results, errors, timings = {}, {}, {}
+    for symbol, result, elapsed_ms in iter_fundamental_data(symbols, max_workers, macro, refresh):
+        timings[symbol] = elapsed_ms
+        if "error" in result:
+            errors[symbol] = result["error"]
+        else:
+            results[symbol] = result
+    return {"results": results, "errors": errors, "timings_ms": timings}
+
+
 def plot_fundamental_quadrant(result, output_path="static/macro_quadrant.png"):
     """
     Plot macro quadrant with current economic coordinates.
     """
+    import matplotlib
+    matplotlib.use("Agg")  # headless
+    import matplotlib.pyplot as plt
+
     x = result["Growth Rate (%)"]
     y = result["Inflation Rate (%)"]
     quadrant = result["Quadrant"]
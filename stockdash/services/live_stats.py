@@ -0,0 +1,434 @@
+# services/live_stats.py
+
+import asyncio
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import Config
+from services.bar_store import BAR_COLUMNS
+from services.PTC import TECHNICAL_INTERVALS, get_intraday_bars
+
+CLOSE = BAR_COLUMNS.index("4. close")
+
+
+class RollingWindow:
+    """
+    The last `size` closed bars, with O(1) (amortized) updates of everything
+    compute_statistics needs: shifted sum / sum of squares, monotonic deques
+    for high/low, and value counts bucketed by frequency for the mode.
+    """
+
+    def __init__(self, size, anchor):
+        self.size = size
+        self.anchor = anchor  # closes are shifted by this for numerical stability
+        self.values = deque()
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self._highs = deque()  # (seq, value), values decreasing
+        self._lows = deque()   # (seq, value), values increasing
+        self.counts = {}
+        self.last_seen = {}
+        self.buckets = {}      # frequency -> set of values
+        self.max_count = 0
+        self.seq = 0
+
+    def _bump(self, value, delta):
+        count = self.counts.get(value, 0)
+        if count:
+            self.buckets[count].discard(value)
+        count += delta
+        if count:
+            self.counts[value] = count
+            self.buckets.setdefault(count, set()).add(value)
+            self.max_count = max(self.max_count, count)
+        else:
+            del self.counts[value]
+            del self.last_seen[value]
+        while self.max_count and not self.buckets.get(self.max_count):
+            self.max_count -= 1
+
+    def push(self, value):
+        if self.size <= 0:
+            return
+        seq = self.seq
+        self.seq += 1
+
+        if len(self.values) == self.size:
+            old = self.values.popleft()
+            shifted = old - self.anchor
+            self.s1 -= shifted
+            self.s2 -= shifted * shifted
+            self._bump(old, -1)
+        oldest = seq - len(self.values)
+        while self._highs and self._highs[0][0] < oldest:
+            self._highs.popleft()
+        while self._lows and self._lows[0][0] < oldest:
+            self._lows.popleft()
+
+        self.values.append(value)
+        shifted = value - self.anchor
+        self.s1 += shifted
+        self.s2 += shifted * shifted
+        while self._highs and self._highs[-1][1] <= value:
+            self._highs.pop()
+        self._highs.append((seq, value))
+        while self._lows and self._lows[-1][1] >= value:
+            self._lows.pop()
+        self._lows.append((seq, value))
+        self.last_seen[value] = seq
+        self._bump(value, 1)
+
+        # Re-sum once per window length so add/subtract drift can't accumulate
+        if seq % self.size == self.size - 1:
+            shifted = np.fromiter(self.values, dtype=np.float64, count=len(self.values)) - self.anchor
+            self.s1 = float(shifted.sum())
+            self.s2 = float((shifted * shifted).sum())
+
+    @property
+    def high(self):
+        return self._highs[0][1] if self._highs else None
+
+    @property
+    def low(self):
+        return self._lows[0][1] if self._lows else None
+
+    def mode(self):
+        """
+        Most frequent value; ties go to the most recently seen value (the
+        first one in newest-first order, as in compute_statistics).
+        """
+        candidates = self.buckets.get(self.max_count)
+        if not candidates:
+            return None
+        return max(candidates, key=self.last_seen.__getitem__)
+
+
+class LiveStatistics:
+    """
+    compute_statistics() maintained bar by bar.
+
+    Each interval n keeps a RollingWindow over the n - 1 newest *closed* bars;
+    the still-forming newest bar (which Alpha Vantage revises until it closes)
+    is folded in at read time, so a revision costs nothing and a new bar is
+    one push per interval.
+    """
+
+    def __init__(self, intervals=TECHNICAL_INTERVALS):
+        self.intervals = list(intervals)
+        self.windows = None
+        self.forming = None  # (timestamp, close) of the newest bar
+
+    def update(self, timestamp, close):
+        """
+        Apply one bar (oldest first). A repeated timestamp revises the forming bar.
+        """
+        if self.windows is None:
+            self.windows = {n: RollingWindow(n - 1, close) for n in self.intervals}
+        elif self.forming is not None and timestamp != self.forming[0]:
+            for window in self.windows.values():
+                window.push(self.forming[1])
+        self.forming = (timestamp, close)
+
+    def _stats(self, window):
+        x = self.forming[1]
+        n = len(window.values) + 1
+        if n < 2:
+            return None
+        shifted = x - window.anchor
+        s1 = window.s1 + shifted
+        s2 = window.s2 + shifted * shifted
+        variance = max((s2 - s1 * s1 / n) / (n - 1), 0.0)
+
+        # The forming bar is the newest value, so it wins any tie
+        if window.counts.get(x, 0) + 1 >= window.max_count:
+            mode = x
+        else:
+            mode = window.mode()
+
+        return {
+            'High': max(x, window.high),
+            'Low': min(x, window.low),
+            'Mean': window.anchor + s1 / n,
+            'Mode': mode,
+            'Variance': variance,
+            'Standard Deviation': variance ** 0.5
+        }
+
+    def statistics(self):
+        if self.forming is None:
+            return {}
+        return {n: self._stats(window) for n, window in self.windows.items()}
+
+
+def _diff(previous, current):
+    """
+    Only the fields that changed, per interval.
+    """
+    changes = {}
+    for interval, stats in current.items():
+        before = previous.get(interval) or {}
+        if stats is None:
+            continue
+        changed = {k: v for k, v in stats.items() if before.get(k) != v}
+        if changed:
+            changes[interval] = changed
+    return changes
+
+
+class Subscription:
+    """
+    One connected client. Messages are queued for the client's reader; if a
+    slow reader lets the queue fill up, the backlog is dropped and replaced
+    by a fresh snapshot so the client never applies deltas out of order.
+    """
+
+    def __init__(self, feed, maxsize=None):
+        self.feed = feed
+        self.queue = self._make_queue(maxsize or Config.LIVE_QUEUE_SIZE)
+
+    def _make_queue(self, maxsize):
+        return queue.Queue(maxsize)
+
+    def deliver(self, message):
+        self._put(message)
+
+    def _put(self, message):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = self.feed.snapshot()
+        self.queue.put_nowait(message)
+
+    def get(self, timeout=None):
+        """
+        Next message, or None after `timeout` seconds without one.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription(Subscription):
+    """
+    Subscription read from an event loop (ASGI); the poller thread hands
+    messages over with call_soon_threadsafe.
+    """
+
+    def __init__(self, feed, loop, maxsize=None):
+        self.loop = loop
+        super().__init__(feed, maxsize)
+
+    def _make_queue(self, maxsize):
+        return asyncio.Queue(maxsize)
+
+    def deliver(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SymbolFeed:
+    """
+    One upstream poller per (symbol, interval), shared by every subscriber.
+
+    The poller reads bars through get_intraday_bars (bar store first, compact
+    upstream tail only when stale), feeds bars newer than the last one seen
+    into LiveStatistics, and broadcasts only the fields that changed.
+    """
+
+    def __init__(self, symbol, interval='5min', intervals=TECHNICAL_INTERVALS):
+        self.symbol = symbol
+        self.interval = interval
+        self.stats = LiveStatistics(intervals)
+        self.subscribers = set()
+        self.last_ts = None
+        self.last_close = None
+        self.seq = 0
+        self.polls = 0
+        self.bars = 0
+        self._sent = {}
+        self.closed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _apply_bars(self):
+        # Caller must hold self._lock; returns True if anything changed
+        timestamps, ohlcv = get_intraday_bars(self.symbol, self.interval)
+        self.polls += 1
+        if not len(timestamps):
+            return False
+
+        if self.last_ts is None:
+            # Cold start: only the bars the largest window can see
+            start = max(len(timestamps) - max(self.stats.intervals), 0)
+        else:
+            start = int(np.searchsorted(timestamps, self.last_ts))
+        changed = False
+        for ts, close in zip(timestamps[start:].tolist(), ohlcv[start:, CLOSE].tolist()):
+            if ts == self.last_ts and close == self.last_close:
+                continue
+            if ts != self.last_ts:
+                self.bars += 1
+            self.stats.update(ts, close)
+            self.last_ts, self.last_close = ts, close
+            changed = True
+        return changed
+
+    def _message(self, kind, statistics):
+        # UTC epoch ms (bar_store timestamps are UTC), like the "t" arrays
+        # elsewhere in the API (serialization.py)
+        bar_ms = self.last_ts * 1000 if self.last_ts is not None else None
+        return {
+            "type": kind,
+            "symbol": self.symbol,
+            "seq": self.seq,
+            "bar": {"t": bar_ms, "close": self.last_close},
+            "statistics": statistics
+        }
+
+    def snapshot(self):
+        return self._message("snapshot", self._sent)
+
+    def subscribe(self, subscription):
+        """
+        Add a subscriber and queue a snapshot for it. Returns False if the
+        feed has already been shut down (its last subscriber left).
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            if self.last_ts is None:
+                self._apply_bars()
+                self._sent = self.stats.statistics()
+            self.subscribers.add(subscription)
+            subscription.deliver(self.snapshot())
+        self.start()
+        return True
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscriber; the feed stops polling once none are left.
+        """
+        with self._lock:
+            self.subscribers.discard(subscription)
+            if not self.subscribers:
+                self.closed = True
+                self._stop.set()
+            return self.closed
+
+    def _broadcast(self, message):
+        for subscription in list(self.subscribers):
+            subscription.deliver(message)
+
+    def poll(self):
+        with self._lock:
+            try:
+                if not self._apply_bars():
+                    return
+            except Exception as e:
+                self._broadcast({"type": "error", "symbol": self.symbol, "error": str(e)})
+                return
+            current = self.stats.statistics()
+            changes = _diff(self._sent, current)
+            self._sent = current
+            self.seq += 1
+            self._broadcast(self._message("delta", changes))
+
+    def _run(self):
+        while not self._stop.wait(Config.LIVE_POLL_SECONDS):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[WARN] Live poll failed for {self.symbol}: {e}")
+
+    def start(self):
+        with self._lock:
+            if not self.closed and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(
+                    target=self._run, name=f"live-{self.symbol}", daemon=True
+                )
+                self._thread.start()
+
+
+class LiveStatsHub:
+    """
+    Registry of SymbolFeeds. The first subscriber to a symbol starts its
+    poller; the last one to leave stops it.
+    """
+
+    def __init__(self):
+        self.feeds = {}
+        self._lock = threading.Lock()
+
+    def _feed(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        with self._lock:
+            feed = self.feeds.get(key)
+            if feed is None:
+                feed = self.feeds[key] = SymbolFeed(*key)
+            return feed
+
+    def subscribe(self, symbol, interval='5min', loop=None):
+        """
+        Register a client; the first message queued is a full snapshot.
+        Pass `loop` to get an AsyncSubscription for use on an event loop.
+        """
+        while True:
+            feed = self._feed(symbol, interval)
+            subscription = AsyncSubscription(feed, loop) if loop else Subscription(feed)
+            try:
+                if feed.subscribe(subscription):
+                    return subscription
+            except Exception:
+                self.unsubscribe(subscription)
+                raise
+            # Lost a race with the feed's last subscriber leaving; use a new feed
+            self._discard(feed)
+
+    def unsubscribe(self, subscription):
+        if subscription.feed.unsubscribe(subscription):
+            self._discard(subscription.feed)
+
+    def _discard(self, feed):
+        with self._lock:
+            key = (feed.symbol, feed.interval)
+            if self.feeds.get(key) is feed:
+                del self.feeds[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                f"{symbol}:{interval}": {
+                    "subscribers": len(feed.subscribers),
+                    "polls": feed.polls,
+                    "bars": feed.bars,
+                    "seq": feed.seq
+                }
+                for (symbol, interval), feed in self.feeds.items()
+            }
+
+
+live_hub = LiveStatsHub()
+
+
+def format_sse(message):
+    """
+    Encode one message as a Server-Sent Events frame.
+    """
+    from services.serialization import dumps
+
+    data = dumps(message).decode()
+    lines = [f"event: {message['type']}"]
+    if "seq" in message:
+        lines.append(f"id: {message['seq']}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,206 @@
+# services/macro_indicators.py
+
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+from config import Config
+from services.fred_cache import fred_cache, ttl_for
+
+
+class IncrementalIndicator:
+    """
+    A FRED series kept locally and extended in place.
+
+    refresh() reads the trailing Config.WAREHOUSE_FRED_REVISION_DAYS of
+    observations from the shared FRED cache (which only asks FRED for the
+    delta), appends the new ones and overwrites revised ones; the derived
+    change over `periods` observations (YoY for monthly data with
+    periods=12) is recomputed only for the points that moved. The full
+    raw + derived history is kept for charting.
+
+    rebuild() refetches the whole series, for revisions older than the window.
+    """
+
+    def __init__(self, series_id, periods=None, root=None):
+        self.series_id = series_id
+        self.periods = periods
+        self.root = root or Config.MACRO_INDICATOR_DIR
+        self.dates = []
+        self.values = []
+        self.changes = []  # % change over `periods` observations (None during warm-up)
+        self.revision = 0  # bumps whenever observations are appended or revised
+        self.last_checked = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    # --- persistence ------------------------------------------------------
+
+    @property
+    def path(self):
+        return os.path.join(self.root, f"{self.series_id}.json")
+
+    def _load(self):
+        try:
+            with open(self.path) as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return
+        self.dates = stored["dates"]
+        self.values = stored["values"]
+        self.last_checked = stored.get("last_checked", 0.0)
+        self.changes = []
+        for i in range(len(self.values)):
+            self.changes.append(self._change_at(i))
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump({
+                "dates": self.dates,
+                "values": self.values,
+                "last_checked": self.last_checked
+            }, fh)
+        os.replace(tmp_path, self.path)
+
+    # --- incremental update -----------------------------------------------
+
+    def _change_at(self, i):
+        if not self.periods or i < self.periods:
+            return None
+        base = self.values[i - self.periods]
+        return (self.values[i] / base - 1) * 100 if base else None
+
+    def _append(self, date, value):
+        self.dates.append(date)
+        self.values.append(value)
+        self.changes.append(self._change_at(len(self.values) - 1))
+
+    def _revise(self, i, value):
+        """
+        Overwrite the value at index i and recompute the changes based on it.
+        """
+        self.values[i] = value
+        for j in (i, i + (self.periods or 0)):
+            if j < len(self.values):
+                self.changes[j] = self._change_at(j)
+
+    def _revision_start(self):
+        if not self.dates:
+            return None
+        since = date.fromisoformat(self.dates[-1]) - timedelta(days=Config.WAREHOUSE_FRED_REVISION_DAYS)
+        return since.isoformat()
+
+    def refresh(self, force=False, refetch=True):
+        """
+        Fetch observations from the revision window: append the ones newer
+        than the last stored date and overwrite stored ones whose value
+        changed. Skipped (no upstream call) while the last check is younger
+        than the series' TTL, unless force=True. A forced refresh also makes
+        the FRED cache refetch the series, unless refetch=False (then it
+        reads the cached copy, which is only refetched once stale).
+        Returns the number of new or revised points.
+        """
+        with self._lock:
+            if not force and self.dates and time.time() - self.last_checked < ttl_for(self.series_id):
+                return 0
+
+            start = self._revision_start()
+            series = fred_cache.get_observations(self.series_id, start, force=force and refetch).dropna()
+
+            changed = 0
+            for stamp, value in series.items():
+                day = stamp.strftime("%Y-%m-%d")
+                value = float(value)
+                if not self.dates or day > self.dates[-1]:
+                    self._append(day, value)
+                    changed += 1
+                    continue
+                i = bisect.bisect_left(self.dates, day)
+                if i < len(self.dates) and self.dates[i] == day and self.values[i] != value:
+                    self._revise(i, value)
+                    changed += 1
+
+            self.last_checked = time.time()
+            if changed:
+                self.revision += 1
+            self._save()
+            return changed
+
+    def rebuild(self):
+        with self._lock:
+            self.dates, self.values, self.changes = [], [], []
+            self.last_checked = 0.0
+        self.refresh(force=True)
+        with self._lock:
+            self.revision += 1
+
+    # --- reads --------------------------------------------------------------
+
+    def latest(self):
+        """
+        (date, value) of the newest observation.
+        Raises LookupError if nothing has been stored yet.
+        """
+        self.refresh()
+        with self._lock:
+            if not self.dates:
+                raise LookupError(f"No observations for {self.series_id}")
+            return self.dates[-1], self.values[-1]
+
+    def latest_change(self):
+        """
+        (date, % change over `periods`) of the newest observation that has
+        one. Raises LookupError while the series is still warming up.
+        """
+        self.refresh()
+        with self._lock:
+            for i in range(len(self.changes) - 1, -1, -1):
+                if self.changes[i] is not None:
+                    return self.dates[i], self.changes[i]
+        raise LookupError(
+            f"No change over {self.periods} observations for {self.series_id} yet"
+        )
+
+    def history(self):
+        self.refresh()
+        with self._lock:
+            return {
+                "series_id": self.series_id,
+                "periods": self.periods,
+                "dates": list(self.dates),
+                "values": list(self.values),
+                "change": list(self.changes)
+            }
+
+
+# Indicators used by the macro quadrant and /economic_data
+INDICATOR_PERIODS = {
+    "A191RL1Q225SBEA": None,  # already a growth rate
+    "CPIAUCSL": 12,           # monthly index -> YoY %
+}
+
+_indicators = {}
+_indicators_lock = threading.Lock()
+
+
+def get_indicator(series_id, periods=None):
+    with _indicators_lock:
+        indicator = _indicators.get(series_id)
+        if indicator is None:
+            indicator = _indicators[series_id] = IncrementalIndicator(
+                series_id, periods if periods is not None else INDICATOR_PERIODS.get(series_id)
+            )
+        return indicator
+
+
+def reset_indicators():
+    """
+    Forget in-memory indicators; the next get_indicator() reloads from disk.
+    """
+    with _indicators_lock:
+        _indicators.clear()
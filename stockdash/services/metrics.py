@@ -0,0 +1,191 @@
+# services/metrics.py
+
+import bisect
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in sorted(items):
+            labels = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(labels + [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(labels + [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(labels)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_labels(list(zip(self.label_names, label_values)))} {value}")
+        return lines
+
+
+route_latency = Histogram(
+    "stockdash_request_duration_seconds", "Request latency per route.",
+    LATENCY_BUCKETS, ("route", "method", "status"))
+route_payload = Histogram(
+    "stockdash_response_bytes", "Response payload size per route.",
+    SIZE_BUCKETS, ("route",))
+upstream_latency = Histogram(
+    "stockdash_upstream_duration_seconds", "Latency of calls to upstream data providers.",
+    LATENCY_BUCKETS, ("upstream",))
+upstream_errors = Counter(
+    "stockdash_upstream_errors_total", "Failed calls to upstream data providers.", ("upstream",))
+
+# name -> callable returning {"hits": int, "misses": int}
+_cache_sources = {}
+
+
+def register_cache(name, stats_fn):
+    _cache_sources[name] = stats_fn
+
+
+@contextmanager
+def upstream_call(upstream):
+    """
+    Time one call to an upstream (alpha_vantage, fred, yfinance, rss).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        upstream_errors.inc(upstream)
+        raise
+    finally:
+        upstream_latency.observe(time.perf_counter() - start, upstream)
+
+
+def observe_request(route, method, status, seconds, payload_bytes):
+    route_latency.observe(seconds, route, method, str(status))
+    if payload_bytes is not None:
+        route_payload.observe(payload_bytes, route)
+
+
+def _render_caches():
+    lines = [
+        "# HELP stockdash_cache_hits_total Cache hits per cache.",
+        "# TYPE stockdash_cache_hits_total counter",
+    ]
+    misses = [
+        "# HELP stockdash_cache_misses_total Cache misses per cache.",
+        "# TYPE stockdash_cache_misses_total counter",
+    ]
+    ratios = [
+        "# HELP stockdash_cache_hit_ratio Hit ratio per cache.",
+        "# TYPE stockdash_cache_hit_ratio gauge",
+    ]
+    for name, stats_fn in sorted(_cache_sources.items()):
+        try:
+            stats = stats_fn()
+        except Exception:
+            continue
+        hits, miss = stats.get("hits", 0), stats.get("misses", 0)
+        labels = _labels([("cache", name)])
+        lines.append(f"stockdash_cache_hits_total{labels} {hits}")
+        misses.append(f"stockdash_cache_misses_total{labels} {miss}")
+        ratios.append(f"stockdash_cache_hit_ratio{labels} {hits / (hits + miss) if hits + miss else 0.0}")
+    return lines + misses + ratios
+
+
+def render_prometheus():
+    lines = []
+    for metric in (route_latency, route_payload, upstream_latency, upstream_errors):
+        lines.extend(metric.render())
+    lines.extend(_render_caches())
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app):
+    """
+    Attach per-route timing, payload sizes, GET /metrics (Prometheus text) and,
+    when Config.PROFILING_ENABLED, ?profile=1 (cProfile summary instead of the body).
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+        if Config.PROFILING_ENABLED and request.args.get("profile") == "1":
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        size = None if response.is_streamed else response.calculate_content_length()
+        observe_request(route, request.method, response.status_code, time.perf_counter() - start, size)
+
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(Config.PROFILE_TOP_N)
+            return Response(out.getvalue(), mimetype="text/plain")
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    return app
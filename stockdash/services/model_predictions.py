@@ -1,10 +1,5 @@
-from sklearn.linear_model import LinearRegression
-  # or: from .data_manger import DataManager
-
-
-
 import numpy as np
-import statsmodels.api as sm
+from services.batched_ols import fit_trends, summary_at
 from services.data_manger import DataManager  # Ensure this has prepare_data()
 
 class ModelPredictions:
@@ -17,12 +12,30 @@ class ModelPredictions:
         :param data: Dictionary or DataFrame compatible with DataManager.prepare_data().
         :return: Trained model, predictions, and stats summary.
         """
-        X, y = DataManager.prepare_data(data)
+        import statsmodels.api as sm
+
+        X, y = DataManager.prepare_data_arrays(data)
         X = sm.add_constant(np.array(X))  # Add intercept
         model = sm.OLS(y, X).fit()
         predictions = model.predict(X)
         return model, predictions
 
+    @staticmethod
+    def train_linear_regression_batch(datasets):
+        """
+        Fit a trend model for every dataset at once with closed-form OLS
+        (stacked NumPy arrays instead of one sm.OLS per dataset).
+
+        :param datasets: {name: data} compatible with DataManager.prepare_data_arrays().
+        :return: fit (dict of arrays ordered like datasets, incl. standard errors)
+                 and {name: summary} in the same format as extract_summary().
+        """
+        names = list(datasets)
+        fit = fit_trends([DataManager.prepare_data_arrays(datasets[name]) for name in names])
+        fit["names"] = names
+        summaries = {name: summary_at(fit, i) for i, name in enumerate(names)}
+        return fit, summaries
+
     @staticmethod
     def extract_summary(model):
         """
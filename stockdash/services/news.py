@@ -1,7 +1,38 @@
 # services/news.py
 
-import feedparser
+import calendar
+import random
+import threading
+import time
+
+import requests
+
 from config import Config
+from services.async_http import get_response, run_blocking
+from services.metrics import upstream_call
+
+SA_FEED_URL = 'https://seekingalpha.com/feed.xml'
+
+# Shared keep-alive session; feeds are downloaded here (with a timeout) and
+# only the bytes are handed to feedparser
+session = requests.Session()
+
+
+def _download(url, etag=None, modified=None):
+    """
+    Conditional GET of a feed. Returns the response (status 200 or 304).
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if modified:
+        headers['If-Modified-Since'] = modified
+    with upstream_call("rss"):
+        response = session.get(url, headers=headers, timeout=Config.HTTP_TIMEOUT)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
 
 # === Fetches latest articles from Seeking Alpha ===
 def get_sa_news(limit=10):
@@ -11,26 +42,202 @@ def get_sa_news(limit=10):
     Returns:
         List of dicts: [{title, link, published, summary}, ...]
     """
-    feed_url = 'https://seekingalpha.com/feed.xml'
-    feed = feedparser.parse(feed_url)
+    import feedparser
+
+    feed = feedparser.parse(_download(SA_FEED_URL).content)
+    return [_public(e) for e in _entries_from_feed(feed, limit)]
+
+
+def _entries_from_feed(feed, limit=None):
     news_entries = []
 
-    if feed.bozo:
+    if feed.bozo and not feed.entries:
         raise Exception("Error parsing RSS feed.")
 
     for entry in feed.entries[:limit]:
         news_entries.append({
-            'title': entry.title,
-            'link': entry.link,
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
             'published': entry.get('published', ''),
-            'summary': entry.get('summary', '')
+            'summary': entry.get('summary', ''),
+            '_sort': calendar.timegm(entry.published_parsed) if entry.get('published_parsed') else 0
         })
 
     return news_entries
 
+
+async def get_sa_news_async(limit=10):
+    """
+    Async variant of get_sa_news: downloads on the pooled HTTP client and
+    parses the already-fetched bytes.
+    """
+    import feedparser
+
+    response = await get_response("rss", SA_FEED_URL)
+    feed = await run_blocking("rss", feedparser.parse, response.content)
+    return [_public(e) for e in _entries_from_feed(feed, limit)]
+
+
+def _public(entry):
+    return {k: v for k, v in entry.items() if not k.startswith('_')}
+
+
+class NewsCache:
+    """
+    In-memory cache of one or more RSS feeds.
+
+    A background thread refreshes every feed with conditional GETs
+    (ETag / Last-Modified), so unchanged feeds cost a 304 and no parsing.
+    A feed that fails keeps its last good entries. Reads merge all feeds,
+    de-duplicate by link and return a prebuilt list.
+    """
+
+    def __init__(self, feed_urls=None, refresh_seconds=None, limit=None):
+        self.feed_urls = list(feed_urls or Config.NEWS_FEEDS)
+        self.refresh_seconds = refresh_seconds or Config.NEWS_REFRESH_SECONDS
+        self.limit = limit or Config.NEWS_LIMIT
+        self._feeds = {url: {'etag': None, 'modified': None, 'entries': [], 'error': None}
+                       for url in self.feed_urls}
+        self._merged = []
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _refresh_feed(self, url):
+        import feedparser
+
+        state = self._feeds[url]
+        try:
+            response = _download(url, state['etag'], state['modified'])
+            if response.status_code == 304:
+                state['error'] = None
+                return False
+            entries = _entries_from_feed(feedparser.parse(response.content))
+        except Exception as e:
+            # Keep serving the last good copy
+            state['error'] = str(e)
+            return False
+
+        state['etag'] = response.headers.get('ETag')
+        state['modified'] = response.headers.get('Last-Modified')
+        state['entries'] = entries
+        state['error'] = None
+        return True
+
+    def refresh(self):
+        """
+        Refresh every feed once; rebuild the merged list if anything changed.
+        """
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        changed = False
+        for url in self.feed_urls:
+            changed |= self._refresh_feed(url)
+
+        if changed or self._refreshed_at is None:
+            seen = set()
+            merged = []
+            for url in self.feed_urls:
+                for entry in self._feeds[url]['entries']:
+                    if entry['link'] in seen:
+                        continue
+                    seen.add(entry['link'])
+                    merged.append(entry)
+            merged.sort(key=lambda e: e['_sort'], reverse=True)
+            with self._lock:
+                self._merged = [_public(e) for e in merged]
+        self._refreshed_at = time.time()
+        return changed
+
+    @property
+    def refreshed_at(self):
+        """
+        Epoch seconds of the last completed refresh (None before the first).
+        """
+        return self._refreshed_at
+
+    @property
+    def ready(self):
+        return self._refreshed_at is not None
+
+    def reset(self):
+        """
+        Forget every feed's entries and validators; the next get() refetches.
+        """
+        with self._refresh_lock:
+            for state in self._feeds.values():
+                state.update(etag=None, modified=None, entries=[], error=None)
+            with self._lock:
+                self._merged = []
+            self._refreshed_at = None
+
+    def _run(self, delay, jitter):
+        while not self._stop.wait(delay):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[WARN] News refresh failed: {e}")
+            delay = self.refresh_seconds * (1 + random.uniform(-jitter, jitter))
+
+    def start(self, first_delay=None, jitter=0.0):
+        """
+        Start the background refresher: first refresh after `first_delay`
+        seconds (default: one refresh interval), then every interval
+        spread by +/- `jitter`.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            delay = self.refresh_seconds if first_delay is None else first_delay
+            self._thread = threading.Thread(
+                target=self._run, args=(delay, jitter), name="news-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def get(self, limit=None):
+        """
+        Return cached entries, newest first. The first call fetches synchronously
+        and starts the background refresher.
+        """
+        if self._refreshed_at is None:
+            with self._refresh_lock:
+                if self._refreshed_at is None:
+                    self._refresh_locked()
+            self.start()
+        with self._lock:
+            entries = self._merged
+        if not entries:
+            errors = [s['error'] for s in self._feeds.values() if s['error']]
+            if errors:
+                raise Exception(errors[0])
+        return entries[:limit or self.limit]
+
+    def errors(self):
+        return {url: s['error'] for url, s in self._feeds.items() if s['error']}
+
+
+news_cache = NewsCache()
+
+
 # === Unified access point for Flask route ===
 def get_news():
     try:
-        return {"news": get_sa_news()}
+        return {"news": news_cache.get()}
+    except Exception as e:
+        return {"error": f"Failed to fetch news: {str(e)}"}
+
+
+async def get_news_async():
+    # Reads are served from memory; only a cold cache blocks on the network
+    try:
+        if not news_cache.ready:
+            return {"news": await run_blocking("rss", news_cache.get)}
+        return {"news": news_cache.get()}
     except Exception as e:
         return {"error": f"Failed to fetch news: {str(e)}"}
@@ -0,0 +1,302 @@
+# services/price_history.py
+
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, timedelta
+
+from config import Config
+from services.metrics import register_cache, upstream_call
+from services.shared_cache import shared_cache
+from services.warehouse import FULL_HISTORY, get_warehouse
+
+
+# yfinance period -> calendar days it reaches back
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+
+# Weekends and market holidays between a period start and its first bar
+COVERAGE_SLACK_DAYS = 5
+
+# Delta downloads re-read this many days of stored bars, so a split or
+# dividend (which re-bases all earlier adjusted prices) shows up as a mismatch
+ADJUSTMENT_OVERLAP_DAYS = 7
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def _period_start(period):
+    """
+    First date (ISO) a yfinance period covers, FULL_HISTORY for "max", or
+    None for periods the warehouse path doesn't handle.
+    """
+    if period == "max":
+        return FULL_HISTORY
+    if period == "ytd":
+        return f"{date.today().year}-01-01"
+    days = PERIOD_DAYS.get(period)
+    return (date.today() - timedelta(days=days)).isoformat() if days else None
+
+
+def _yf_download(tickers, period, interval, start=None):
+    import yfinance as yf
+
+    # An explicit start (delta download) replaces the period
+    window = {"start": start} if start else {"period": period}
+    with upstream_call("yfinance"):
+        return yf.download(
+            tickers,
+            **window,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False
+        )
+
+
+def _covered_from(frame, start):
+    """
+    `start` if a full-period download reaches back to it (allowing for the
+    first trading day falling a few days later), else the first stored date,
+    e.g. for a symbol listed after `start`.
+    """
+    first = frame.index[0].date()
+    if start == FULL_HISTORY or first <= date.fromisoformat(start) + timedelta(days=COVERAGE_SLACK_DAYS):
+        return start
+    return first.isoformat()
+
+
+def _readjusted(stored, fresh):
+    """
+    True if a fresh download's adjusted closes disagree with the stored ones
+    on the days both cover, i.e. a split or dividend has re-based the whole
+    history since it was stored. The last stored bar is left out: it may
+    have been a session still in progress.
+    """
+    import numpy as np
+
+    common = stored.index[:-1].intersection(fresh.index)
+    if not len(common) or "Close" not in fresh:
+        return False
+    return not np.allclose(
+        stored.loc[common, "Close"].to_numpy(), fresh.loc[common, "Close"].to_numpy(),
+        rtol=ADJUSTMENT_TOLERANCE, atol=0
+    )
+
+
+class PriceHistoryProvider:
+    """
+    Shared OHLCV history for all callers (app.py, econometrics, forecasting).
+
+    Requests for different symbols with the same (period, interval) that
+    arrive within Config.PRICE_BATCH_WINDOW_MS are coalesced into one
+    multi-ticker yf.download. Frames are cached per (symbol, period, interval)
+    for Config.PRICE_CACHE_TTL seconds (in process and in the cross-worker
+    shared cache), and concurrent requests for the same symbol share one
+    pending result. Daily bars are kept in the warehouse, so only the
+    missing tail is downloaded once a symbol's history is stored (and the
+    whole stored window again after a split or dividend re-adjusts it).
+    """
+
+    def __init__(self, window_ms=None, ttl=None, downloader=None):
+        self.window = (window_ms if window_ms is not None else Config.PRICE_BATCH_WINDOW_MS) / 1000
+        self.ttl = ttl if ttl is not None else Config.PRICE_CACHE_TTL
+        self._download = downloader or _yf_download
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._pending = {}
+        self.upstream_calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def _fetch(self, tickers, period, interval, **window):
+        data = self._download(tickers, period, interval, **window)
+        with self._lock:
+            self.upstream_calls += 1
+        return data
+
+    def _enqueue(self, symbol, period, interval):
+        # Caller must hold self._lock
+        batch_key = (period, interval)
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = {}
+            timer = threading.Timer(self.window, self._flush, args=(batch_key,))
+            timer.daemon = True
+            timer.start()
+        future = batch.get(symbol)
+        if future is None:
+            future = batch[symbol] = Future()
+        return future
+
+    def _flush(self, batch_key):
+        period, interval = batch_key
+        with self._lock:
+            batch = self._pending.pop(batch_key, {})
+        if not batch:
+            return
+
+        # Frames another worker downloaded recently
+        for symbol in list(batch):
+            entry = shared_cache.get(self._shared_key(symbol, period, interval))
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                with self._lock:
+                    self._cache[(symbol, period, interval)] = entry
+                batch.pop(symbol).set_result(entry[1])
+        if not batch:
+            return
+
+        symbols = list(batch)
+        warehouse = get_warehouse() if interval == "1d" else None
+        try:
+            if warehouse is not None and _period_start(period) is not None:
+                frames = self._from_warehouse(warehouse, symbols, period)
+            else:
+                data = self._fetch(symbols, period, interval)
+                frames = {symbol: self._split(data, symbol) for symbol in symbols}
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        now = time.time()
+        for symbol, future in batch.items():
+            frame = frames[symbol]
+            with self._lock:
+                self._cache[(symbol, period, interval)] = (now, frame)
+            shared_cache.set(self._shared_key(symbol, period, interval), (now, frame), self.ttl)
+            future.set_result(frame)
+
+    def _from_warehouse(self, warehouse, symbols, period):
+        """
+        Daily frames read from the warehouse, downloading only what is missing:
+        symbols not yet stored back to the period start get one batched
+        `period` download; stored but stale ones get one batched download
+        starting ADJUSTMENT_OVERLAP_DAYS before the oldest last-stored date.
+        Stored prices are split/dividend adjusted as of their download, so a
+        stale symbol whose overlapping closes no longer match gets its whole
+        stored window downloaded again instead of just the tail. Offline mode
+        downloads nothing.
+
+        A symbol is only recorded as covered from the period start when the
+        download actually reaches back that far, and a download that returns
+        no rows for it leaves its sync time alone, so it is retried.
+        """
+        start = _period_start(period)
+        full, delta = [], []
+        for symbol in symbols:
+            covered = warehouse.covered_from("prices", symbol)
+            last = warehouse.last_price_date(symbol)
+            if covered is None or covered > start or last is None:
+                full.append(symbol)
+            elif not warehouse.is_fresh(warehouse.synced_at("prices", symbol), Config.WAREHOUSE_PRICE_TTL):
+                delta.append((symbol, last))
+
+        if not warehouse.offline:
+            if full:
+                data = self._fetch(full, period, "1d")
+                for symbol in full:
+                    frame = self._split(data, symbol)
+                    if warehouse.upsert_prices(symbol, frame):
+                        warehouse.mark_synced("prices", symbol, covered_from=_covered_from(frame, start))
+            if delta:
+                since = date.fromisoformat(min(last for _, last in delta)) - timedelta(days=ADJUSTMENT_OVERLAP_DAYS)
+                data = self._fetch([symbol for symbol, _ in delta], period, "1d", start=since.isoformat())
+                readjust = []
+                for symbol, last in delta:
+                    frame = self._split(data, symbol)
+                    if _readjusted(warehouse.prices(symbol, start=since.isoformat(), end=last), frame):
+                        readjust.append(symbol)
+                    elif warehouse.upsert_prices(symbol, frame):
+                        warehouse.mark_synced("prices", symbol)
+                if readjust:
+                    self._redownload(warehouse, readjust)
+
+        lookup_start = None if start == FULL_HISTORY else start
+        return {symbol: warehouse.prices(symbol, start=lookup_start) for symbol in symbols}
+
+    def _redownload(self, warehouse, symbols):
+        """
+        Replace every stored bar of `symbols` with one fresh batched download
+        reaching back as far as the oldest stored coverage.
+        """
+        covered = [warehouse.covered_from("prices", symbol) for symbol in symbols]
+        if FULL_HISTORY in covered:
+            data = self._fetch(symbols, "max", "1d")
+        else:
+            data = self._fetch(symbols, "max", "1d", start=min(covered))
+        for symbol in symbols:
+            if warehouse.upsert_prices(symbol, self._split(data, symbol)):
+                warehouse.mark_synced("prices", symbol)
+
+    @staticmethod
+    def _shared_key(symbol, period, interval):
+        return f"prices:{symbol}:{period}:{interval}"
+
+    @staticmethod
+    def _split(data, symbol):
+        columns = getattr(data, "columns", None)
+        if columns is not None and getattr(columns, "nlevels", 1) > 1:
+            if symbol not in columns.get_level_values(0):
+                return data.iloc[0:0, 0:0]
+            frame = data[symbol]
+        else:
+            frame = data
+        return frame.dropna(how="all")
+
+    def get_many(self, symbols, period="1mo", interval="1d", timeout=None):
+        """
+        Return {symbol: DataFrame (Open/High/Low/Close/Volume)}.
+        Symbols with no data map to an empty frame.
+        """
+        futures = {}
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                frame = self._cached((symbol, period, interval))
+                if frame is not None:
+                    self.hits += 1
+                    futures[symbol] = frame
+                else:
+                    self.misses += 1
+                    futures[symbol] = self._enqueue(symbol, period, interval)
+
+        timeout = timeout or Config.HTTP_TIMEOUT * 2
+        return {
+            symbol: f.result(timeout=timeout) if isinstance(f, Future) else f
+            for symbol, f in futures.items()
+        }
+
+    def get(self, symbol, period="1mo", interval="1d", timeout=None):
+        return self.get_many([symbol], period, interval, timeout)[symbol]
+
+    def closes(self, symbols, period="1mo", interval="1d"):
+        """
+        Close prices as one DataFrame (dates x symbols).
+        """
+        import pandas as pd
+
+        frames = self.get_many(symbols, period, interval)
+        return pd.DataFrame({
+            symbol: frame["Close"] for symbol, frame in frames.items() if "Close" in frame
+        })
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "upstream_calls": self.upstream_calls,
+                "entries": len(self._cache)
+            }
+
+
+price_history = PriceHistoryProvider()
+register_cache("price_history", price_history.stats)
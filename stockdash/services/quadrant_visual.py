@@ -1,8 +1,28 @@
 # services/quadrant_visual.py
-import matplotlib.pyplot as plt
+import glob
+import hashlib
+import io
+import os
+import threading
 
-def draw_macro_quadrant_box(growth, inflation, output_path="static/macro_box.png"):
-    fig, ax = plt.subplots(figsize=(8, 6))
+from config import Config
+
+# (growth, inflation, fmt) -> (image bytes, content hash)
+_image_cache = {}
+_image_lock = threading.Lock()
+
+MIME_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def _render(growth, inflation, fmt):
+    # Figure + Agg canvas directly (no pyplot global state), safe across threads
+    from matplotlib import rc_context
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.axhline(0, color="black")
     ax.axvline(0, color="black")
 
@@ -23,6 +43,86 @@ def draw_macro_quadrant_box(growth, inflation, output_path="static/macro_box.png
     ax.legend()
     ax.grid(True)
 
-    plt.savefig(output_path)
-    plt.close()
+    buffer = io.BytesIO()
+    # Fixed metadata (and, for SVG, a fixed id salt) keeps the output
+    # byte-identical for identical inputs, across renders and workers
+    metadata = {"Software": None} if fmt == "png" else {"Date": None, "Creator": None}
+    rc = {"svg.hashsalt": "stockdash-macro-box"} if fmt == "svg" else {}
+    with rc_context(rc):
+        fig.savefig(buffer, format=fmt, metadata=metadata)
+    return buffer.getvalue()
+
+
+def render_macro_quadrant_box(growth, inflation, fmt="png"):
+    """
+    Return (image bytes, content hash) for the quadrant chart, rendering only
+    the first time a given (growth, inflation, fmt) is requested.
+    Nothing touches the filesystem.
+    """
+    if fmt not in MIME_TYPES:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    key = (round(float(growth), 2), round(float(inflation), 2), fmt)
+
+    with _image_lock:
+        cached = _image_cache.get(key)
+    if cached is not None:
+        return cached
+
+    image = _render(key[0], key[1], fmt)
+    cached = (image, hashlib.sha256(image).hexdigest()[:16])
+    with _image_lock:
+        # Keep only the current snapshot's images plus a little history
+        if len(_image_cache) >= Config.MACRO_IMAGE_CACHE_SIZE:
+            _image_cache.pop(next(iter(_image_cache)))
+        _image_cache[key] = cached
+    return cached
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _prune_images(directory, fmt, keep):
+    """
+    Delete all but the `keep` most recently used macro_box_*.<fmt> files.
+    """
+    paths = glob.glob(os.path.join(directory, f"macro_box_*.{fmt}"))
+    if len(paths) <= keep:
+        return
+    for path in sorted(paths, key=_mtime, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def draw_macro_quadrant_box(growth, inflation, output_path=None, fmt="png"):
+    """
+    Write the quadrant chart to Config.MACRO_IMAGE_DIR (static/) under a
+    content-hash filename (macro_box_<hash>.png) and return the path. The
+    file is only written if it does not already exist, and the write is
+    atomic, so concurrent requests never see a half-written image. Only the
+    Config.MACRO_IMAGE_FILES_KEEP most recently used charts are kept on disk.
+    """
+    image, digest = render_macro_quadrant_box(growth, inflation, fmt)
+    if output_path is None:
+        output_path = os.path.join(Config.MACRO_IMAGE_DIR, f"macro_box_{digest}.{fmt}")
+
+    if os.path.exists(output_path):
+        # Mark as recently used so pruning keeps it
+        try:
+            os.utime(output_path)
+        except OSError:
+            pass
+    else:
+        directory = os.path.dirname(output_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(image)
+        os.replace(tmp_path, output_path)
+        _prune_images(directory, fmt, Config.MACRO_IMAGE_FILES_KEEP)
     return output_path
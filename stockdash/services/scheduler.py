@@ -0,0 +1,214 @@
+# services/scheduler.py
+
+import heapq
+import os
+import random
+import threading
+import time
+
+from config import Config
+
+
+class Job:
+    def __init__(self, name, fn, interval, jitter):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.jitter = jitter
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_duration_ms = None
+        self.total_duration_ms = 0.0
+        self.last_error = None
+
+    def next_delay(self):
+        # Spread each run by +/- jitter so several workers don't hit upstreams together
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def stats(self):
+        return {
+            "interval_s": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_duration_ms": self.last_duration_ms,
+            "avg_duration_ms": round(self.total_duration_ms / self.runs, 1) if self.runs else None,
+            "last_error": self.last_error
+        }
+
+
+class Scheduler:
+    """
+    Minimal in-process interval scheduler (one daemon thread).
+    Jobs run back to back on that thread; each is rescheduled with jitter
+    after it finishes, and its first run is offset by a random fraction of
+    its interval.
+    """
+
+    def __init__(self, jitter=None):
+        self.jitter = jitter if jitter is not None else Config.SCHEDULER_JITTER
+        self.jobs = {}
+        self._queue = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_job(self, name, fn, interval, run_now=True):
+        job = Job(name, fn, interval, self.jitter)
+        first = random.uniform(0, min(interval, 30) * self.jitter) if run_now else job.next_delay()
+        with self._lock:
+            self.jobs[name] = job
+            heapq.heappush(self._queue, (time.time() + first, name))
+        self._wake.set()
+        return job
+
+    def run_job(self, name):
+        job = self.jobs[name]
+        start = time.perf_counter()
+        try:
+            job.fn()
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"[WARN] Scheduled job {name} failed: {e}")
+        elapsed = (time.perf_counter() - start) * 1000
+        job.runs += 1
+        job.last_run = time.time()
+        job.last_duration_ms = round(elapsed, 1)
+        job.total_duration_ms += elapsed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                due_at, name = self._queue[0] if self._queue else (None, None)
+            if due_at is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            delay = due_at - time.time()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                heapq.heappop(self._queue)
+            self.run_job(name)
+            with self._lock:
+                heapq.heappush(self._queue, (time.time() + self.jobs[name].next_delay(), name))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="prewarm-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self):
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+
+scheduler = Scheduler()
+
+
+def _refresh_macro():
+    from services.econdata import MATURITY_MAP
+    from services.four_quadrant import _macro_indicators, get_macro_snapshot
+    from services.fred_cache import fred_cache
+    from services.yield_curve import yield_curve
+
+    # Refetch each series shortly before its release-cadence TTL runs out,
+    # then fold the cached copy into the indicator (no second upstream call)
+    for indicator in _macro_indicators():
+        fred_cache.prefetch(indicator.series_id)
+        indicator.refresh(force=True, refetch=False)
+    get_macro_snapshot()
+
+    # Keep the Treasury curve warm
+    for series_id in MATURITY_MAP.values():
+        fred_cache.prefetch(series_id)
+    yield_curve.matrix()
+
+
+def _start_news():
+    from services.news import news_cache
+
+    # News lives in each worker's memory, so every worker warms its own copy,
+    # offset and jittered like the jobs so workers don't fetch together
+    first = random.uniform(0, min(Config.NEWS_REFRESH_SECONDS, 30) * Config.SCHEDULER_JITTER)
+    news_cache.start(first_delay=first, jitter=Config.SCHEDULER_JITTER)
+
+
+def _refresh_fundamentals():
+    from services.fundamental import get_fundamental_data_many
+
+    get_fundamental_data_many(Config.WATCHLIST, refresh=True)
+
+
+def _refresh_intraday():
+    from services.PTC import get_intraday_bars
+
+    # Runs at 2/3 of the bar-store TTL and always refreshes, so watched
+    # symbols are updated before a user request finds them stale
+    for symbol in Config.WATCHLIST:
+        try:
+            get_intraday_bars(symbol, force=True)
+        except Exception as e:
+            print(f"[WARN] Intraday refresh failed for {symbol}: {e}")
+
+
+_leader_lock = None
+
+
+def _acquire_leader_lock(path):
+    """
+    Non-blocking exclusive lock on `path`, held for the life of the process.
+    With several workers on one host only the first to get it runs the jobs.
+    """
+    global _leader_lock
+
+    if _leader_lock is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:  # no flock on this platform; every process schedules
+        return True
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _leader_lock = handle
+    return True
+
+
+def start_scheduler(lock_path=None):
+    """
+    Register the pre-warm jobs (intervals from Config) and start the thread.
+    News is not a job: NewsCache runs its own refresher thread, started here
+    in every worker. Safe to call more than once. With `lock_path`
+    (multi-worker deployments) the scheduler only starts in the worker
+    holding the lock.
+    """
+    _start_news()
+    if lock_path and not _acquire_leader_lock(lock_path):
+        return scheduler
+    if not scheduler.jobs:
+        scheduler.add_job("macro", _refresh_macro, Config.SCHEDULE_MACRO_SECONDS)
+        if Config.WATCHLIST:
+            scheduler.add_job("fundamentals", _refresh_fundamentals, Config.SCHEDULE_FUNDAMENTALS_SECONDS)
+            scheduler.add_job("intraday", _refresh_intraday, Config.SCHEDULE_INTRADAY_SECONDS)
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,130 @@
+# services/serialization.py
+
+import gzip
+import json
+import math
+
+import numpy as np
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+def epoch_ms(index):
+    """
+    DatetimeIndex -> int64 array of epoch milliseconds (UTC), no Python loop.
+    """
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+
+def series_pairs(index, values):
+    """
+    [[epoch_ms, value], ...] — the row format the charts already consume.
+    """
+    ts = epoch_ms(index).tolist()
+    vals = np.asarray(values, dtype=np.float64).tolist()
+    return [list(pair) for pair in zip(ts, vals)]
+
+
+def series_columns(index, **columns):
+    """
+    Columnar form: {"t": [epoch_ms...], "<name>": [values...], ...}.
+    Arrays are left as NumPy so orjson can encode them without conversion.
+    """
+    out = {"t": epoch_ms(index)}
+    for name, values in columns.items():
+        out[name] = np.asarray(values, dtype=np.float64)
+    return out
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_CONTAINERS = frozenset((dict, list, tuple))
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS) if orjson else 0
+
+
+def _key(key):
+    # A dict key as orjson writes it under OPT_NON_STR_KEYS
+    if isinstance(key, str):
+        return key
+    if isinstance(key, np.generic):
+        key = key.item()
+    if key is None or isinstance(key, (bool, float)):
+        return json.dumps(key)
+    if hasattr(key, "isoformat"):
+        return key.isoformat()
+    return str(key)
+
+
+def _normalize(obj, finite):
+    """
+    Copy of `obj` with string keys in sorted order, as orjson writes them.
+    With `finite`, NaN/±inf become None (orjson already writes them as
+    null), so the stdlib encoder produces the same document.
+    """
+    if isinstance(obj, dict):
+        items = sorted(((_key(k), v) for k, v in obj.items()), key=lambda item: item[0])
+        return {k: _normalize(v, finite) for k, v in items}
+    if isinstance(obj, (list, tuple)):
+        if not finite and _CONTAINERS.isdisjoint(map(type, obj)):
+            return obj
+        return [_normalize(v, finite) for v in obj]
+    if finite:
+        if isinstance(obj, (float, np.floating)):
+            return obj if math.isfinite(obj) else None
+        if isinstance(obj, np.ndarray) and obj.dtype.kind == "f" and not np.isfinite(obj).all():
+            return np.where(np.isfinite(obj), obj.astype(object), None).tolist()
+    return obj
+
+
+def dumps(payload):
+    """
+    Compact JSON bytes with sorted keys. orjson encodes the payload as is;
+    only a payload it rejects (e.g. NumPy scalar dict keys) and the stdlib
+    fallback go through _normalize first.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return orjson.dumps(_normalize(payload, finite=False), default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        _normalize(payload, finite=True), default=_default, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def json_response(payload, status=200):
+    """
+    Drop-in for jsonify() that encodes NumPy arrays directly (orjson when installed).
+    """
+    return Response(dumps(payload), status=status, mimetype="application/json")
+
+
+def compressed_json_response(payload, request, level=6, min_bytes=1024, status=200):
+    """
+    json_response() gzip-encoded when the client accepts it and the body is
+    worth compressing.
+    """
+    body = dumps(payload)
+    response = Response(body, status=status, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if len(body) >= min_bytes and "gzip" in request.accept_encodings:
+        response.set_data(gzip.compress(body, compresslevel=level, mtime=0))
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def wants_columnar(request):
+    return request.args.get("format") == "columnar"
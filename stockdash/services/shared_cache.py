@@ -0,0 +1,180 @@
+# services/shared_cache.py
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from config import Config
+from services.metrics import register_cache
+
+
+class NullCache:
+    """
+    No cross-process tier: every worker relies on its own in-memory caches.
+    Used for CACHE_TYPE "simple" (the default) and "null".
+    """
+
+    shared = False
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"hits": 0, "misses": 0}
+
+
+class SQLiteCache:
+    """
+    Cross-process cache in one local SQLite file (WAL mode), so every
+    gunicorn/uvicorn worker on the host sees the others' upstream results.
+
+    Values are pickled; entries expire after `timeout` seconds
+    (Config.CACHE_DEFAULT_TIMEOUT when not given). Point `path` at /dev/shm
+    to keep it in shared memory.
+    """
+
+    shared = True
+
+    def __init__(self, path, default_timeout=None, prune_every=500):
+        self.path = path
+        self.default_timeout = default_timeout if default_timeout is not None else Config.CACHE_DEFAULT_TIMEOUT
+        self.prune_every = prune_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+
+    def _connect(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=Config.CACHE_SQLITE_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > time.time():
+                value = pickle.loads(row[0])
+                with self._stats_lock:
+                    self.hits += 1
+                return value
+        except sqlite3.Error as e:
+            print(f"[WARN] Shared cache read failed for {key}: {e}")
+        except Exception as e:
+            # pickle.loads can raise almost anything for a stale or foreign
+            # entry (AttributeError, ImportError, ...); treat it as a miss
+            print(f"[WARN] Shared cache entry for {key} could not be unpickled: {e}")
+        with self._stats_lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value, timeout=None):
+        timeout = timeout if timeout is not None else self.default_timeout
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + timeout, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            print(f"[WARN] Shared cache write failed for {key}: {e}")
+
+    def delete(self, key):
+        try:
+            self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            print(f"[WARN] Shared cache delete failed for {key}: {e}")
+
+    def clear(self):
+        try:
+            self._connect().execute("DELETE FROM cache")
+        except sqlite3.Error as e:
+            print(f"[WARN] Shared cache clear failed: {e}")
+
+    def stats(self):
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+# Config.CACHE_TYPE -> backend (Flask-Caching style names accepted)
+BACKENDS = {
+    "simple": NullCache,
+    "simplecache": NullCache,
+    "null": NullCache,
+    "nullcache": NullCache,
+    "sqlite": SQLiteCache,
+    "filesystem": SQLiteCache,
+    "filesystemcache": SQLiteCache,
+}
+
+
+def create_cache(cache_type=None):
+    cache_type = (cache_type or Config.CACHE_TYPE).lower()
+    backend = BACKENDS.get(cache_type)
+    if backend is None:
+        raise ValueError(f"Unsupported CACHE_TYPE: {cache_type}")
+    if backend is SQLiteCache:
+        return SQLiteCache(Config.CACHE_SQLITE_PATH)
+    return NullCache()
+
+
+class _CacheProxy:
+    """
+    Module-level handle whose backend is built from Config on first use, so
+    importing services never opens the cache file.
+    """
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = create_cache()
+        return self._backend
+
+    def configure(self, backend=None):
+        """
+        Swap the backend (None rebuilds it from Config on next use).
+        """
+        with self._lock:
+            self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+
+# Shared instance used by fundamental.py, price_history.py and alpha_vantage.py
+shared_cache = _CacheProxy()
+register_cache("shared", lambda: shared_cache.stats())
@@ -0,0 +1,386 @@
+# services/warehouse.py
+#
+# Local time-series warehouse in the SQLite database named by
+# Config.SQLALCHEMY_DATABASE_URI. Services read history from here first and
+# only ask upstream for what is missing or stale; with WAREHOUSE_OFFLINE=True
+# they never go upstream at all (historical backtests).
+#
+# Backfill for offline use (from stockdash/):
+#   python -m services.warehouse --symbols AAPL MSFT --period 10y --fred GS10 CPIAUCSL
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fred_observations (
+    series_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series_id, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS economic_observations (
+    function TEXT NOT NULL,
+    params TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (function, params, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS economic_meta (
+    function TEXT NOT NULL,
+    params TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    PRIMARY KEY (function, params)
+);
+
+CREATE TABLE IF NOT EXISTS daily_prices (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS fundamentals_snapshots (
+    symbol TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (symbol, taken_at)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    covered_from TEXT,
+    PRIMARY KEY (dataset, key)
+);
+"""
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# covered_from marker for a full ("max") history
+FULL_HISTORY = "0000-00-00"
+
+
+def sqlite_path(uri):
+    """
+    sqlite:///app.db -> app.db, sqlite:////abs/app.db -> /abs/app.db,
+    sqlite:// -> :memory:. Other databases are not supported (stdlib sqlite3).
+    """
+    if not uri.startswith("sqlite:"):
+        raise ValueError(f"Only sqlite:// database URIs are supported, got {uri}")
+    if uri.startswith("sqlite:///"):
+        path = uri[len("sqlite:///"):]
+    else:
+        path = uri[len("sqlite:"):].lstrip("/")
+    return path or ":memory:"
+
+
+def canonical_params(params):
+    """
+    Stable key for a set of call parameters (auth/format keys dropped).
+    """
+    return "&".join(
+        f"{k}={v}" for k, v in sorted(params.items())
+        if k not in ("apikey", "datatype", "cache_timeout")
+    )
+
+
+class Warehouse:
+    """
+    Indexed tables keyed by (symbol | series_id, date) with bulk upserts and
+    range queries, plus a sync_state table recording when each dataset/key
+    was last refreshed from upstream (and, for prices, how far back it goes).
+    """
+
+    def __init__(self, path, offline=None):
+        self.path = path
+        self.offline = Config.WAREHOUSE_OFFLINE if offline is None else offline
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=Config.CACHE_SQLITE_TIMEOUT)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # --- sync state -------------------------------------------------------
+
+    def synced_at(self, dataset, key):
+        row = self._connect().execute(
+            "SELECT synced_at FROM sync_state WHERE dataset = ? AND key = ?", (dataset, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def covered_from(self, dataset, key):
+        row = self._connect().execute(
+            "SELECT covered_from FROM sync_state WHERE dataset = ? AND key = ?", (dataset, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, dataset, key, covered_from=None):
+        """
+        Record a successful upstream refresh. covered_from only ever moves
+        earlier (a short refresh never shrinks what is known to be stored).
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (dataset, key, synced_at, covered_from) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (dataset, key) DO UPDATE SET synced_at = excluded.synced_at, "
+                "covered_from = CASE WHEN sync_state.covered_from IS NULL THEN excluded.covered_from "
+                "WHEN excluded.covered_from IS NULL THEN sync_state.covered_from "
+                "ELSE MIN(sync_state.covered_from, excluded.covered_from) END",
+                (dataset, key, time.time(), covered_from)
+            )
+
+    def is_fresh(self, synced_at, ttl):
+        """
+        True when stored data can be served without an upstream call.
+        Offline mode treats everything stored as fresh.
+        """
+        return self.offline or (synced_at is not None and time.time() - synced_at < ttl)
+
+    # --- FRED -------------------------------------------------------------
+
+    def upsert_series(self, series_id, series):
+        """
+        Bulk upsert a pandas Series (DatetimeIndex -> value); NaNs are skipped.
+        """
+        series = series.dropna()
+        rows = zip(
+            [series_id] * len(series),
+            series.index.strftime("%Y-%m-%d").tolist(),
+            series.astype(float).tolist()
+        )
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO fred_observations (series_id, date, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (series_id, date) DO UPDATE SET value = excluded.value",
+                rows
+            )
+        return len(series)
+
+    def series(self, series_id, start=None, end=None):
+        """
+        Stored observations in [start, end] as a pandas Series, oldest first.
+        """
+        import pandas as pd
+
+        rows = self._connect().execute(
+            "SELECT date, value FROM fred_observations WHERE series_id = ? "
+            "AND date >= ? AND date <= ? ORDER BY date",
+            (series_id, start or "", end or "9999-12-31")
+        ).fetchall()
+        dates = [r[0] for r in rows]
+        return pd.Series([r[1] for r in rows], index=pd.to_datetime(dates), name=series_id, dtype=float)
+
+    def last_series_date(self, series_id):
+        row = self._connect().execute(
+            "SELECT MAX(date) FROM fred_observations WHERE series_id = ?", (series_id,)
+        ).fetchone()
+        return row[0]
+
+    # --- Alpha Vantage economic data --------------------------------------
+
+    def upsert_economic(self, function, params, payload):
+        """
+        Store an Alpha Vantage economic payload ({"name", ..., "data": [{"date", "value"}]}).
+        Values are kept as the strings Alpha Vantage sent ("." marks a gap).
+        """
+        meta = {k: v for k, v in payload.items() if k != "data"}
+        rows = [(function, params, entry["date"], entry.get("value")) for entry in payload["data"]]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO economic_observations (function, params, date, value) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (function, params, date) DO UPDATE SET value = excluded.value",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO economic_meta (function, params, meta) VALUES (?, ?, ?)",
+                (function, params, json.dumps(meta))
+            )
+        return len(rows)
+
+    def economic_payload(self, function, params, start=None, end=None):
+        """
+        Rebuild the Alpha Vantage payload (newest first, as the API returns
+        it) for [start, end], or None if nothing is stored.
+        """
+        conn = self._connect()
+        meta = conn.execute(
+            "SELECT meta FROM economic_meta WHERE function = ? AND params = ?", (function, params)
+        ).fetchone()
+        if meta is None:
+            return None
+        rows = conn.execute(
+            "SELECT date, value FROM economic_observations WHERE function = ? AND params = ? "
+            "AND date >= ? AND date <= ? ORDER BY date DESC",
+            (function, params, start or "", end or "9999-12-31")
+        ).fetchall()
+        return {**json.loads(meta[0]), "data": [{"date": d, "value": v} for d, v in rows]}
+
+    # --- daily prices -----------------------------------------------------
+
+    def upsert_prices(self, symbol, frame):
+        """
+        Bulk upsert a daily OHLCV DataFrame (DatetimeIndex, yfinance column names).
+        """
+        frame = frame.dropna(subset=["Close"]) if "Close" in frame else frame.iloc[0:0]
+        if frame.empty:
+            return 0
+        dates = frame.index.strftime("%Y-%m-%d").tolist()
+        columns = [
+            frame[c].astype(float).tolist() if c in frame else [None] * len(frame)
+            for c in PRICE_COLUMNS
+        ]
+        rows = zip([symbol] * len(frame), dates, *columns)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO daily_prices (symbol, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (symbol, date) DO UPDATE SET "
+                "open = excluded.open, high = excluded.high, low = excluded.low, "
+                "close = excluded.close, volume = excluded.volume",
+                rows
+            )
+        return len(dates)
+
+    def prices(self, symbol, start=None, end=None):
+        """
+        Stored daily bars in [start, end] as a DataFrame shaped like yfinance output.
+        """
+        import pandas as pd
+
+        rows = self._connect().execute(
+            "SELECT date, open, high, low, close, volume FROM daily_prices WHERE symbol = ? "
+            "AND date >= ? AND date <= ? ORDER BY date",
+            (symbol, start or "", end or "9999-12-31")
+        ).fetchall()
+        frame = pd.DataFrame(
+            [r[1:] for r in rows], columns=list(PRICE_COLUMNS),
+            index=pd.to_datetime([r[0] for r in rows]), dtype=float
+        )
+        frame.index.name = "Date"
+        return frame
+
+    def last_price_date(self, symbol):
+        row = self._connect().execute(
+            "SELECT MAX(date) FROM daily_prices WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        return row[0]
+
+    # --- fundamentals -----------------------------------------------------
+
+    def add_fundamentals(self, symbol, data, taken_at=None):
+        taken_at = taken_at or datetime.utcnow().isoformat(timespec="seconds")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fundamentals_snapshots (symbol, taken_at, data) VALUES (?, ?, ?)",
+                (symbol, taken_at, json.dumps(data, default=str))
+            )
+
+    def fundamentals_history(self, symbol, start=None, end=None):
+        """
+        [(taken_at, data), ...] oldest first.
+        """
+        rows = self._connect().execute(
+            "SELECT taken_at, data FROM fundamentals_snapshots WHERE symbol = ? "
+            "AND taken_at >= ? AND taken_at <= ? ORDER BY taken_at",
+            (symbol, start or "", end or "9999-12-31T23:59:59")
+        ).fetchall()
+        return [(t, json.loads(d)) for t, d in rows]
+
+    def latest_fundamentals(self, symbol):
+        """
+        (taken_at epoch seconds, data) of the newest snapshot, or None.
+        """
+        row = self._connect().execute(
+            "SELECT taken_at, data FROM fundamentals_snapshots WHERE symbol = ? "
+            "ORDER BY taken_at DESC LIMIT 1", (symbol,)
+        ).fetchone()
+        if row is None:
+            return None
+        taken_at = datetime.fromisoformat(row[0]).replace(tzinfo=timezone.utc).timestamp()
+        return taken_at, json.loads(row[1])
+
+    def stats(self):
+        conn = self._connect()
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("fred_observations", "economic_observations", "daily_prices",
+                          "fundamentals_snapshots")
+        }
+
+
+_warehouse = None
+_warehouse_lock = threading.Lock()
+
+
+def get_warehouse():
+    """
+    Shared Warehouse, or None when Config.WAREHOUSE_ENABLED is off.
+    """
+    global _warehouse
+
+    if not Config.WAREHOUSE_ENABLED:
+        return None
+    if _warehouse is None:
+        with _warehouse_lock:
+            if _warehouse is None:
+                _warehouse = Warehouse(sqlite_path(Config.SQLALCHEMY_DATABASE_URI))
+    return _warehouse
+
+
+def reset_warehouse():
+    """
+    Drop the shared instance; the next get_warehouse() reopens it from Config.
+    """
+    global _warehouse
+
+    with _warehouse_lock:
+        _warehouse = None
+
+
+def backfill(symbols=(), period="10y", fred_series=()):
+    """
+    Pull history into the warehouse so backtests can run with WAREHOUSE_OFFLINE=True.
+    """
+    from services.fred_cache import fred_cache
+    from services.price_history import price_history
+
+    for series_id in fred_series:
+        fred_cache.prefetch(series_id, margin=1)  # always refresh
+        print(f"{series_id}: {len(get_warehouse().series(series_id))} observations")
+    if symbols:
+        frames = price_history.get_many([s.upper() for s in symbols], period=period)
+        for symbol, frame in frames.items():
+            print(f"{symbol}: {len(frame)} daily bars")
+    print(get_warehouse().stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", nargs="*", default=[])
+    parser.add_argument("--period", default="10y")
+    parser.add_argument("--fred", nargs="*", default=[])
+    args = parser.parse_args()
+    backfill(args.symbols, args.period, args.fred)
@@ -0,0 +1,149 @@
+# services/yield_curve.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config import Config
+from services.async_http import run_blocking
+from services.econdata import MATURITY_MAP
+from services.fred_cache import fred_cache
+
+# name -> (short leg, long leg), in percentage points (long - short)
+SPREADS = {
+    "2s10s": ("2y", "10y"),
+    "3m10y": ("3m", "10y"),
+}
+
+
+def _round(value):
+    return None if value != value else round(float(value), 2)
+
+
+def _parse_date(value, name):
+    # ValueError (-> 400) for anything but YYYY-MM-DD
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a date in YYYY-MM-DD format") from None
+
+
+class YieldCurvePanel:
+    """
+    Every Treasury maturity in MATURITY_MAP aligned into one date x maturity
+    matrix.
+
+    The GS* series are pulled concurrently through the shared FRED cache (so
+    each is downloaded once per TTL), and the matrix is rebuilt only when one
+    of the cached series objects changes. Latest curve, curves by date and
+    spreads are all read from the in-memory matrix.
+    """
+
+    def __init__(self, cache=fred_cache, maturities=MATURITY_MAP):
+        self.cache = cache
+        self.maturities = list(maturities)
+        self.series_ids = [maturities[m] for m in self.maturities]
+        self._lock = threading.Lock()
+        self._sources = None
+        self._frame = None
+
+    def _fetch_all(self):
+        workers = min(len(self.series_ids), Config.ASYNC_UPSTREAM_LIMITS.get("fred", 8))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.cache.get_series, self.series_ids))
+
+    def matrix(self):
+        """
+        DataFrame indexed by observation date with one column per maturity.
+        """
+        import pandas as pd
+
+        series_list = self._fetch_all()
+        with self._lock:
+            if self._sources is not None and all(
+                    a is b for a, b in zip(self._sources, series_list)):
+                return self._frame
+
+            frame = pd.concat(
+                [s.dropna() for s in series_list], axis=1, keys=self.maturities
+            ).sort_index()
+            frame = frame.dropna(how="all")
+            frame.index.name = "date"
+
+            self._frame = frame
+            self._sources = series_list
+            return frame
+
+    def _row(self, frame, i):
+        # Parallel lists keep maturity order (jsonify sorts dict keys)
+        return {
+            "date": frame.index[i].strftime("%Y-%m-%d"),
+            "maturities": list(frame.columns),
+            "yields": [_round(v) for v in frame.iloc[i].to_numpy()]
+        }
+
+    def latest(self):
+        """
+        Most recent curve with every maturity observed (falls back to the last row).
+        """
+        frame = self.matrix()
+        complete = frame.notna().all(axis=1).to_numpy().nonzero()[0]
+        return self._row(frame, complete[-1] if len(complete) else len(frame) - 1)
+
+    def curve_on(self, date):
+        """
+        Curve as of `date` (last observation on or before it).
+        """
+        import pandas as pd
+
+        frame = self.matrix()
+        i = frame.index.searchsorted(pd.Timestamp(date), side="right") - 1
+        if i < 0:
+            raise ValueError(f"No yield curve on or before {date}")
+        return self._row(frame, i)
+
+    def _window(self, start=None, end=None):
+        start = _parse_date(start, "start") if start else None
+        end = _parse_date(end, "end") if end else None
+        if start and end and start > end:
+            raise ValueError("'start' must not be after 'end'")
+        frame = self.matrix()
+        return frame.loc[start:end] if start or end else frame
+
+    def history(self, start=None, end=None):
+        """
+        Historical curves in columnar form: dates, maturities, yields[date][maturity].
+        """
+        frame = self._window(start, end)
+        values = frame.to_numpy().round(2)
+        return {
+            "maturities": list(frame.columns),
+            "dates": frame.index.strftime("%Y-%m-%d").tolist(),
+            "yields": [[None if v != v else float(v) for v in row] for row in values]
+        }
+
+    def spreads(self, start=None, end=None):
+        """
+        2s10s and 3m10y spreads (long minus short, percentage points) per date,
+        plus the latest value of each.
+        """
+        frame = self._window(start, end)
+        result = {"dates": frame.index.strftime("%Y-%m-%d").tolist(), "latest": {}}
+        for name, (short, long) in SPREADS.items():
+            values = (frame[long] - frame[short]).round(2)
+            result[name] = [None if v != v else float(v) for v in values.to_numpy()]
+            observed = values.dropna()
+            result["latest"][name] = float(observed.iloc[-1]) if len(observed) else None
+        return result
+
+
+# Shared instance (the matrix is rebuilt only when a GS* series refreshes)
+yield_curve = YieldCurvePanel()
+
+
+def get_yield_curve(date=None):
+    return yield_curve.curve_on(date) if date else yield_curve.latest()
+
+
+async def get_yield_curve_async(date=None):
+    return await run_blocking("fred", get_yield_curve, date)
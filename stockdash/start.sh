@@ -1,8 +1,15 @@
 #!/bin/bash
 
 # Start Flask backend (from root)
-echo "Starting Flask backend (app.py)..."
-python3 app.py &
+# MODE=production serves app.py through gunicorn (workers/threads from
+# WEB_WORKERS / WEB_THREADS; see wsgi.py); otherwise the Flask dev server.
+if [ "$MODE" = "production" ]; then
+  echo "Starting Flask backend (app.py) under gunicorn..."
+  gunicorn -c gunicorn.conf.py app:app &
+else
+  echo "Starting Flask backend (app.py)..."
+  python3 app.py &
+fi
 
 FLASK_PID=$!
 sleep 3  # Let Flask spin up
@@ -36,6 +36,29 @@ document.addEventListener('DOMContentLoaded', () => {
     output.innerHTML = `<pre>${JSON.stringify(data, null, 2)}</pre>`;
   }
 
+  function showMacro(json) {
+    displayData(json, 'quad-results');
+    const img = document.getElementById('macro-box-img');
+    if (img && json && json.img) {
+      img.src = json.img;
+      img.style.display = 'block';
+    }
+  }
+
+  function renderNews(json) {
+    const out = document.getElementById('news-results');
+    if (!out) return;
+    if (json && json.news && json.news.length) {
+      out.innerHTML = json.news
+        .map(item =>
+          `<p><a href="${item.link}" target="_blank">${item.title}</a><br><small>${item.published}</small></p>`
+        )
+        .join('');
+    } else {
+      out.innerHTML = '<p>No news available.</p>';
+    }
+  }
+
   // === 3. Stock Data handler ===
   const stockForm = document.getElementById('stock-data-form');
   if (stockForm) {
@@ -45,11 +68,15 @@ document.addEventListener('DOMContentLoaded', () => {
       if (!symbol) return alert('Please enter a stock symbol.');
       const out = document.getElementById('stock-data-results');
       out.innerHTML = '<p>Loading stock data...</p>';
-      fetch(`/fundamental_stock_data/${encodeURIComponent(symbol)}`)
+      // One round-trip fills the stock, technical, macro quadrant and news panels
+      fetch(`/dashboard/${encodeURIComponent(symbol)}`)
         .then(res => res.ok ? res.json() : Promise.reject(res.statusText))
         .then(json => {
-          displayData(json, 'stock-data-results');
+          displayData(json.fundamentals, 'stock-data-results');
+          displayData(json.technical, 'technical-results');
           initTradingView(symbol);
+          showMacro(json.macro);
+          renderNews(json.news);
         })
         .catch(err => {
           out.innerHTML = `<p style="color:red;">Error: ${err}</p>`;
@@ -115,13 +142,7 @@ document.addEventListener('DOMContentLoaded', () => {
       img.style.display = 'none';
       fetch('/macro_box')
         .then(res => res.ok ? res.json() : Promise.reject(res.statusText))
-        .then(json => {
-          displayData(json, 'quad-results');
-          if (json.img) {
-            img.src = json.img;
-            img.style.display = 'block';
-          }
-        })
+        .then(showMacro)
         .catch(err => {
           out.innerHTML = `<p style="color:red;">Error: ${err}</p>`;
         });
@@ -137,17 +158,7 @@ document.addEventListener('DOMContentLoaded', () => {
       out.innerHTML = '<p>Loading market news...</p>';
       fetch('/market_news')
         .then(res => res.ok ? res.json() : Promise.reject(res.statusText))
-        .then(json => {
-          if (json.news && json.news.length) {
-            out.innerHTML = json.news
-              .map(item =>
-                `<p><a href="${item.link}" target="_blank">${item.title}</a><br><small>${item.published}</small></p>`
-              )
-              .join('');
-          } else {
-            out.innerHTML = '<p>No news available.</p>';
-          }
-        })
+        .then(renderNews)
         .catch(err => {
           out.innerHTML = `<p style="color:red;">Error: ${err}</p>`;
         });
@@ -0,0 +1,19 @@
+# wsgi.py
+#
+# Production entry point. From stockdash/:
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app                 # threaded WSGI workers
+#   WEB_MODE=asgi gunicorn -c gunicorn.conf.py asgi:app   # uvicorn workers (SSE, async routes)
+#   gunicorn -c gunicorn.conf.py app:app                  # the frontend API in app.py
+#
+# Worker count, threads, bind address and mode come from Config (WEB_WORKERS,
+# WEB_THREADS, WEB_BIND, WEB_MODE, WEB_TIMEOUT). Set CACHE_TYPE=sqlite so all
+# workers share yfinance and Alpha Vantage results through one local SQLite
+# file (CACHE_SQLITE_PATH; put it under /dev/shm to keep it in memory).
+# FRED series, intraday bars and macro indicators are already shared through
+# their on-disk stores (FRED_CACHE_DIR, BAR_STORE_DIR, MACRO_INDICATOR_DIR).
+# With SCHEDULER_ENABLED=True only one worker runs the pre-warm jobs.
+
+from fmain import create_app
+
+app = create_app()